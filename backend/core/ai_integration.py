@@ -1,14 +1,17 @@
 import os
+import time
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional
+from backend.utils.metrics import timed
+from backend.utils.lazy_import import lazy_module
 
-# Import necessary libraries for AI integration
-try:
-    import google.generativeai as genai
-    from transformers import pipeline
-except ImportError:
-    logging.error("Required libraries for AI integration not installed.")
-    logging.error("Please run: pip install google-generativeai transformers")
+# Libraries for AI integration are imported on first use; transformers alone
+# takes seconds to import
+genai = lazy_module("google.generativeai", "google-generativeai")
+transformers = lazy_module("transformers", "transformers")
 
 class GeminiAI:
     """Handles integration with Google's Gemini AI for natural language processing
@@ -23,12 +26,22 @@ class GeminiAI:
                 - model_name: The model to use (default: "gemini-pro")
                 - temperature: Sampling temperature (default: 0.7)
                 - max_output_tokens: Maximum output length (default: 1024)
+                - api_endpoint: Override the Gemini API endpoint (e.g. a local stub)
+                - sentiment_analysis: Load the sentiment model (default: True)
+                - max_concurrency: Worker threads for blocking SDK calls (default: 8)
         """
         self.config = config
         self.api_key = config.get("gemini_api_key")
         self.model_name = config.get("model_name", "gemini-pro")
         self.temperature = config.get("temperature", 0.7)
         self.max_output_tokens = config.get("max_output_tokens", 1024)
+        self.api_endpoint = config.get("api_endpoint")
+        self.warmed_at = float("-inf")
+        # SDK calls block a thread for the whole request. A dedicated, bounded
+        # pool keeps them from crowding out audio decoding and recognition on
+        # the default executor.
+        self.executor = ThreadPoolExecutor(max_workers=config.get("max_concurrency", 8),
+                                           thread_name_prefix="gemini")
         
         # Initialize Gemini AI
         if not self.api_key:
@@ -36,7 +49,11 @@ class GeminiAI:
             self.model = None
         else:
             try:
-                genai.configure(api_key=self.api_key)
+                if self.api_endpoint:
+                    genai.configure(api_key=self.api_key, transport="rest",
+                                    client_options={"api_endpoint": self.api_endpoint})
+                else:
+                    genai.configure(api_key=self.api_key)
                 self.model = genai.GenerativeModel(model_name=self.model_name)
                 logging.info(f"Gemini AI initialized with model: {self.model_name}")
             except Exception as e:
@@ -44,12 +61,60 @@ class GeminiAI:
                 self.model = None
         
         # Initialize sentiment analysis pipeline
+        self.sentiment_analyzer = None
+        if config.get("sentiment_analysis", True):
+            try:
+                self.sentiment_analyzer = transformers.pipeline("sentiment-analysis")
+            except Exception as e:
+                logging.error(f"Failed to initialize sentiment analysis: {e}")
+    
+    async def warm(self, max_age: float = 60.0) -> bool:
+        """Open the connection to the Gemini API ahead of a request.
+        
+        Sends a token count request (no generation) at most once per
+        ``max_age`` seconds, so connection setup is not paid by the next
+        ``generate`` call.
+        
+        Args:
+            max_age: Seconds a previous warm-up is trusted
+            
+        Returns:
+            bool: True if the connection is warm
+        """
+        if not self.model:
+            return False
+        now = time.monotonic()
+        if now - self.warmed_at < max_age:
+            return True
+        self.warmed_at = now
         try:
-            self.sentiment_analyzer = pipeline("sentiment-analysis")
+            await self._call(self.model.count_tokens, "warm-up")
+            return True
         except Exception as e:
-            logging.error(f"Failed to initialize sentiment analysis: {e}")
-            self.sentiment_analyzer = None
+            logging.warning(f"Gemini warm-up failed: {e}")
+            self.warmed_at = float("-inf")
+            return False
     
+    async def _call(self, request: Callable, *args) -> Any:
+        """Run a blocking SDK call on the Gemini executor.
+        
+        Cancelling the caller cancels a call still queued for a thread. A
+        call already running cannot be stopped, so CancelledError is only
+        raised once it has finished: a ResourcePool slot the caller holds
+        for the request is then released when the work really ends.
+        """
+        future = self.executor.submit(request, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            while not future.done():
+                try:
+                    await asyncio.wait([asyncio.wrap_future(future)])
+                except asyncio.CancelledError:
+                    pass
+            raise
+    
+    @timed("llm.generate")
     async def generate(self, prompt: str, context: Optional[List[Dict[str, str]]] = None) -> str:
         """Generate a response using Gemini AI.
         
@@ -59,24 +124,29 @@ class GeminiAI:
             
         Returns:
             str: Generated response from Gemini AI
+            
+        Raises:
+            asyncio.CancelledError: If cancelled; only after the SDK call ended (see _call)
         """
         if not self.model:
             return "I'm sorry, but I'm currently unable to process AI requests. Please check your API configuration."
         
+        generation_config = {
+            "temperature": self.temperature,
+            "max_output_tokens": self.max_output_tokens,
+        }
         try:
             # Prepare conversation context if provided
             if context:
                 chat = self.model.start_chat(history=context)
-                response = chat.send_message(prompt, 
-                                           temperature=self.temperature,
-                                           max_output_tokens=self.max_output_tokens)
+                request = functools.partial(chat.send_message, prompt, generation_config=generation_config)
             else:
                 # One-off generation without context
-                generation_config = {
-                    "temperature": self.temperature,
-                    "max_output_tokens": self.max_output_tokens,
-                }
-                response = self.model.generate_content(prompt, generation_config=generation_config)
+                request = functools.partial(self.model.generate_content, prompt,
+                                            generation_config=generation_config)
+            # The SDK call blocks; run it off the event loop so other
+            # sessions (and speculative requests) proceed meanwhile
+            response = await self._call(request)
             
             return response.text
         except Exception as e:
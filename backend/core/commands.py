@@ -0,0 +1,46 @@
+from typing import Iterable, NamedTuple, Optional
+
+# Leading words that address the assistant rather than give the command
+WAKE_WORDS = ("hey", "jarvis")
+
+COMMAND_VERBS = {
+    "open": "launch_application",
+    "launch": "launch_application",
+    "start": "launch_application",
+    "run": "launch_application",
+    "close": "close_application",
+    "quit": "close_application",
+    "exit": "close_application",
+}
+
+
+class Command(NamedTuple):
+    """A transcript recognized as a SystemController action."""
+
+    action: str
+    target: str
+
+
+def parse_command(text: str, known_apps: Iterable[str]) -> Optional[Command]:
+    """Recognize "open <app>" / "close <app>" style commands.
+
+    Only applications configured in ``known_apps`` are recognized, so
+    ordinary sentences starting with "start" or "run" still go to the LLM.
+
+    Args:
+        text: Transcript (any case)
+        known_apps: Configured application names (SystemController.app_paths)
+
+    Returns:
+        Optional[Command]: The command, or None if the text is not one
+    """
+    words = text.lower().split()
+    while words and words[0] in WAKE_WORDS:
+        words.pop(0)
+    if len(words) < 2 or words[0] not in COMMAND_VERBS:
+        return None
+    target_words = words[2:] if words[1] == "the" else words[1:]
+    target = " ".join(target_words)
+    if target not in {app.lower() for app in known_apps}:
+        return None
+    return Command(COMMAND_VERBS[words[0]], target)
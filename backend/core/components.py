@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from backend.utils.startup_profiler import startup_profiler
+
+
+class ComponentRegistry:
+    """Builds the backend's heavy components (models, engines, clients)
+    after the server is accepting requests, and reports readiness.
+
+    A required component that fails to build is retried with exponential
+    backoff; meanwhile ``failed`` is True so readiness can report a stuck
+    start rather than a slow one.
+    """
+
+    def __init__(self, retry_delay: float = 5.0, max_retry_delay: float = 300.0):
+        """Initialize an empty registry.
+
+        Args:
+            retry_delay: Seconds before the first rebuild of failed required
+                components (0 disables retries)
+            max_retry_delay: Upper bound of the doubling delay between rebuilds
+        """
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.builders: Dict[str, Callable[[], Any]] = {}
+        self.required: Dict[str, bool] = {}
+        self.instances: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.build_task: Optional[asyncio.Future] = None
+
+    def register(self, name: str, builder: Callable[[], Any], required: bool = True):
+        """Register a component.
+
+        Args:
+            name: Component name, used with ``get``
+            builder: Zero-argument callable that constructs the component
+            required: Whether the service is not ready without it
+        """
+        self.builders[name] = builder
+        self.required[name] = required
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return a built component, or None if it is not (yet) available."""
+        return self.instances.get(name)
+
+    @property
+    def ready(self) -> bool:
+        """True once every required component has been built."""
+        return all(name in self.instances for name, required in self.required.items() if required)
+
+    @property
+    def failed(self) -> bool:
+        """True while a required component's last build attempt failed."""
+        return any(name in self.errors for name, required in self.required.items() if required)
+
+    def build(self):
+        """Build every component that is not built yet, in registration order.
+
+        Safe to call more than once: the gunicorn master calls it before
+        forking so workers inherit loaded models, and each worker's lifespan
+        calls it again to pick up anything still missing.
+        """
+        for name, builder in self.builders.items():
+            if name in self.instances:
+                continue
+            try:
+                with startup_profiler.component(name):
+                    self.instances[name] = builder()
+                self.errors.pop(name, None)
+            except Exception as e:
+                self.errors[name] = str(e)
+                logging.error(f"Failed to build component {name}: {e}")
+        if self.ready:
+            startup_profiler.checkpoint("components_ready")
+
+    def start_background_build(self) -> asyncio.Future:
+        """Build components on a worker thread so the event loop keeps serving
+        liveness checks (and anything else not needing them) meanwhile, and
+        rebuild failed required components until they succeed."""
+        if self.build_task is None:
+            self.build_task = asyncio.ensure_future(self._build_until_ready())
+        return self.build_task
+
+    async def _build_until_ready(self):
+        loop = asyncio.get_running_loop()
+        delay = self.retry_delay
+        while True:
+            await loop.run_in_executor(None, self.build)
+            if self.ready or not self.retry_delay:
+                return
+            failed = [name for name, required in self.required.items() if required and name in self.errors]
+            logging.warning(f"Required components failed to build ({', '.join(failed)}); retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_retry_delay)
+
+    async def stop(self):
+        """Stop retrying failed builds (a build already running finishes on its thread)."""
+        if self.build_task is not None and not self.build_task.done():
+            self.build_task.cancel()
+            try:
+                await self.build_task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> Dict[str, str]:
+        """Per-component status: ready, failed or pending."""
+        return {
+            name: "ready" if name in self.instances else "failed" if name in self.errors else "pending"
+            for name in self.builders
+        }
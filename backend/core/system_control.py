@@ -1,15 +1,16 @@
 import os
+import time
+import shutil
 import logging
 import subprocess
 from typing import Dict, Any, List, Optional, Tuple
+from backend.utils.metrics import timed
+from backend.utils.lazy_import import lazy_module
 
-# Import necessary libraries for system control
-try:
-    import pyautogui
-    import psutil
-except ImportError:
-    logging.error("Required libraries for system control not installed.")
-    logging.error("Please run: pip install pyautogui psutil")
+# Libraries for system control are imported on first use; pyautogui
+# connects to the display server when imported
+pyautogui = lazy_module("pyautogui", "pyautogui")
+psutil = lazy_module("psutil", "psutil")
 
 class SystemController:
     """Handles system control operations including application management,
@@ -22,14 +23,76 @@ class SystemController:
             config: Dictionary containing configuration parameters
                 - app_paths: Dictionary mapping app names to their executable paths
                 - default_file_dir: Default directory for file operations
+                - process_cache_ttl: Seconds a process table snapshot is reused
+                  by lookups (default: 2)
         """
         self.config = config
         self.app_paths = config.get("app_paths", {})
         self.default_file_dir = config.get("default_file_dir", os.path.expanduser("~"))
+        self.process_cache_ttl = config.get("process_cache_ttl", 2.0)
+        
+        # Lookups cached so they can be done ahead of the command (see
+        # backend/services/speculation.py)
+        self._resolved_apps: Dict[str, Optional[str]] = {}
+        self._process_snapshot: List[Tuple[int, str]] = []
+        self._process_snapshot_at = float("-inf")
         
         # Set PyAutoGUI failsafe
         pyautogui.FAILSAFE = True
     
+    def resolve_application(self, app_name: str) -> Optional[str]:
+        """Resolve an application name to its executable path.
+        
+        Bare executable names are looked up on PATH once and cached.
+        
+        Args:
+            app_name: Name of the application
+            
+        Returns:
+            Optional[str]: Executable path, or None if not configured
+        """
+        key = app_name.lower()
+        if key not in self._resolved_apps:
+            app_path = self.app_paths.get(key)
+            if app_path and not os.path.isabs(app_path):
+                app_path = shutil.which(app_path) or app_path
+            self._resolved_apps[key] = app_path
+        return self._resolved_apps[key]
+    
+    def find_processes(self, app_name: str, refresh: bool = False) -> List[Tuple[int, str]]:
+        """Find running processes whose name contains ``app_name``.
+        
+        Walking the process table is slow, so a snapshot is reused for
+        ``process_cache_ttl`` seconds.
+        
+        Args:
+            app_name: Case-insensitive partial process name
+            refresh: Take a new snapshot even if the current one is fresh
+            
+        Returns:
+            List[Tuple[int, str]]: (pid, name) of matching processes
+        """
+        now = time.monotonic()
+        if refresh or now - self._process_snapshot_at > self.process_cache_ttl:
+            self._process_snapshot = [(proc.info['pid'], proc.info['name'] or "")
+                                      for proc in psutil.process_iter(['pid', 'name'])]
+            self._process_snapshot_at = now
+        needle = app_name.lower()
+        return [(pid, name) for pid, name in self._process_snapshot if needle in name.lower()]
+    
+    def prefetch(self, action: str, target: str):
+        """Do the lookups a command will need before it is issued.
+        
+        Args:
+            action: "launch_application" or "close_application"
+            target: Application name
+        """
+        if action == "launch_application":
+            self.resolve_application(target)
+        elif action == "close_application":
+            self.find_processes(target, refresh=True)
+    
+    @timed("system.launch_application")
     def launch_application(self, app_name: str) -> bool:
         """Launch an application by name.
         
@@ -39,7 +102,7 @@ class SystemController:
         Returns:
             bool: True if successful, False otherwise
         """
-        app_path = self.app_paths.get(app_name.lower())
+        app_path = self.resolve_application(app_name)
         
         if not app_path:
             logging.warning(f"No path configured for application: {app_name}")
@@ -53,6 +116,7 @@ class SystemController:
             logging.error(f"Failed to launch application {app_name}: {e}")
             return False
     
+    @timed("system.close_application")
     def close_application(self, app_name: str) -> bool:
         """Close an application by name.
         
@@ -63,12 +127,15 @@ class SystemController:
             bool: True if successful, False otherwise
         """
         try:
-            for proc in psutil.process_iter(['pid', 'name']):
-                # Case-insensitive partial match for process name
-                if app_name.lower() in proc.info['name'].lower():
-                    pid = proc.info['pid']
-                    process = psutil.Process(pid)
-                    process.terminate()
+            # A cached snapshot may be missing a just-started process; retry
+            # with a fresh one before giving up
+            for refresh in (False, True):
+                for pid, _ in self.find_processes(app_name, refresh=refresh):
+                    try:
+                        psutil.Process(pid).terminate()
+                    except psutil.NoSuchProcess:
+                        # Exited since the snapshot was taken
+                        continue
                     logging.info(f"Closed application: {app_name}")
                     return True
             
@@ -78,6 +145,7 @@ class SystemController:
             logging.error(f"Failed to close application {app_name}: {e}")
             return False
     
+    @timed("system.get_running_applications")
     def get_running_applications(self) -> List[str]:
         """Get a list of currently running applications.
         
@@ -93,6 +161,7 @@ class SystemController:
             logging.error(f"Failed to get running applications: {e}")
             return []
     
+    @timed("system.adjust_volume")
     def adjust_volume(self, level: int) -> bool:
         """Adjust system volume level.
         
@@ -135,6 +204,7 @@ class SystemController:
             logging.error(f"Failed to adjust volume: {e}")
             return False
     
+    @timed("system.adjust_brightness")
     def adjust_brightness(self, level: int) -> bool:
         """Adjust screen brightness level.
         
@@ -182,6 +252,7 @@ class SystemController:
             logging.error(f"Failed to adjust brightness: {e}")
             return False
     
+    @timed("system.file_operation")
     def file_operation(self, operation: str, source: str, destination: Optional[str] = None) -> bool:
         """Perform file operations like copy, move, delete.
         
@@ -231,6 +302,7 @@ class SystemController:
             logging.error(f"File operation error: {e}")
             return False
     
+    @timed("system.take_screenshot")
     def take_screenshot(self, save_path: Optional[str] = None) -> Optional[str]:
         """Take a screenshot of the current screen.
         
@@ -256,6 +328,7 @@ class SystemController:
             logging.error(f"Failed to take screenshot: {e}")
             return None
     
+    @timed("system.get_system_info")
     def get_system_info(self) -> Dict[str, Any]:
         """Get system information including CPU, memory, disk usage.
         
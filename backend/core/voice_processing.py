@@ -1,17 +1,18 @@
 import os
+import json
+import asyncio
 import logging
 from typing import Optional, Dict, Any
+from backend.utils.admission import PRIORITY_NORMAL
+from backend.utils.metrics import timed
+from backend.utils.lazy_import import lazy_module
 
-# Import necessary libraries for voice processing
-try:
-    import speech_recognition as sr
-    from vosk import Model, KaldiRecognizer
-    import json
-    from langdetect import detect
-    import pyttsx3
-except ImportError:
-    logging.error("Required libraries for voice processing not installed.")
-    logging.error("Please run: pip install vosk langdetect speechrecognition pyttsx3")
+# Libraries for voice processing are imported on first use, so importing
+# this module (and backend.main) stays fast
+sr = lazy_module("speech_recognition", "speechrecognition")
+vosk = lazy_module("vosk", "vosk")
+langdetect = lazy_module("langdetect", "langdetect")
+pyttsx3 = lazy_module("pyttsx3", "pyttsx3")
 
 class VoiceProcessor:
     """Handles all voice-related processing including wake word detection,
@@ -25,17 +26,20 @@ class VoiceProcessor:
                 - wake_word: The wake word to listen for (default: "Hey JARVIS")
                 - vosk_models_path: Path to Vosk model directory
                 - tts_model: Text-to-speech model to use
+                - stt_pool: ResourcePool capping concurrent transcriptions
+                  (default: none, only the default executor's thread count)
         """
         self.config = config
         self.wake_word = config.get("wake_word", "Hey JARVIS")
+        self.stt_pool = config.get("stt_pool")
         
         # Initialize speech recognizer
         self.recognizer = sr.Recognizer()
         
         # Initialize Vosk models
         try:
-            self.en_model = Model("vosk-model-small-en-us-0.15")
-            self.hi_model = Model("vosk-model-small-hi-0.22")
+            self.en_model = vosk.Model("vosk-model-small-en-us-0.15")
+            self.hi_model = vosk.Model("vosk-model-small-hi-0.22")
             self.current_model = self.en_model  # Default to English
         except Exception as e:
             logging.error(f"Failed to initialize Vosk models: {e}")
@@ -77,28 +81,56 @@ class VoiceProcessor:
         except:
             return False
     
-    async def transcribe(self, audio_data) -> str:
+    def create_recognizer(self, language: str = "en", sample_rate: int = 16000):
+        """Create a Vosk recognizer for one utterance.
+        
+        Args:
+            language: "en" or "hi"
+            sample_rate: Sample rate of the audio that will be fed to it
+            
+        Returns:
+            KaldiRecognizer: A fresh recognizer for the language's model
+        """
+        model = self.hi_model if language == "hi" else self.en_model
+        return vosk.KaldiRecognizer(model, sample_rate)
+
+    @timed("stt.transcribe")
+    async def transcribe(self, audio_data, language: Optional[str] = None, priority: int = PRIORITY_NORMAL) -> str:
         """Convert speech to text using Vosk with automatic language detection.
         
+        Recognition is CPU-bound and runs on the default executor, under a
+        slot of ``stt_pool`` when one is configured.
+        
         Args:
             audio_data: Audio data to transcribe
+            language: Skip detection and use this model ("en" or "hi")
+            priority: Admission lane of the stt_pool slot
             
         Returns:
             str: Transcribed text
+            
+        Raises:
+            AdmissionError: If the STT pool is saturated and the request was shed
         """
+        if self.stt_pool is not None:
+            return await self.stt_pool.run_in_executor(priority, self._transcribe, audio_data, language)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._transcribe, audio_data, language)
+
+    def _transcribe(self, audio_data, language: Optional[str]) -> str:
         try:
-            # First attempt with English model
-            rec = KaldiRecognizer(self.en_model, 16000)
+            # First attempt with English model unless a language was given
+            rec = self.create_recognizer(language or "en")
             rec.AcceptWaveform(audio_data)
             result = json.loads(rec.FinalResult())
             text = result.get("text", "")
             
             # Detect language
-            if text and len(text.strip()) > 0:
+            if not language and text and len(text.strip()) > 0:
                 try:
-                    lang = detect(text)
+                    lang = langdetect.detect(text)
                     if lang == "hi":  # If Hindi detected, retry with Hindi model
-                        rec = KaldiRecognizer(self.hi_model, 16000)
+                        rec = self.create_recognizer("hi")
                         rec.AcceptWaveform(audio_data)
                         result = json.loads(rec.FinalResult())
                         text = result.get("text", "")
@@ -141,16 +173,17 @@ class VoiceProcessor:
             logging.error(f"Speech synthesis error: {e}")
             return None
 
-    async def process_voice_input(self, audio_data) -> str:
+    async def process_voice_input(self, audio_data, priority: int = PRIORITY_NORMAL) -> str:
         """Process voice input from microphone.
         
         Args:
             audio_data: Audio data from microphone
+            priority: Admission lane for the transcription (see transcribe)
             
         Returns:
             str: Transcribed text from the audio
         """
-        return await self.transcribe(audio_data)
+        return await self.transcribe(audio_data, priority=priority)
 
     def listen_for_command(self):
         """Listen for a command using the microphone.
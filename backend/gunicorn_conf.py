@@ -0,0 +1,78 @@
+# Gunicorn configuration for running JARVIS with multiple workers
+#
+#   gunicorn -c backend/gunicorn_conf.py backend.main:app
+#
+# Settings can be overridden with the JARVIS_* environment variables below.
+import itertools
+import multiprocessing
+import os
+
+from backend.utils.pubsub import LocalPubSubHub, parse_local_url
+
+bind = os.getenv("JARVIS_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("JARVIS_WORKERS", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import backend.main once in the master before forking; on_starting then
+# builds the components (Vosk models etc.) so workers share the model pages
+# copy-on-write instead of each loading their own copy.
+preload_app = True
+
+# Seconds gunicorn gives a worker after SIGTERM before killing it
+graceful_timeout = int(os.getenv("JARVIS_GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("JARVIS_WORKER_TIMEOUT", "120"))
+keepalive = 5
+
+# backend.main reads these while the app is preloaded, so set them before that
+os.environ["JARVIS_WORKERS"] = str(workers)
+if workers > 1:
+    os.environ.setdefault(
+        "JARVIS_MESSAGE_QUEUE", f"local://127.0.0.1:{os.getenv('JARVIS_BUS_PORT', '8765')}"
+    )
+# The app drains in-flight work first (JARVIS_DRAIN_TIMEOUT), then uvicorn
+# closes connections; keep both inside gunicorn's budget so the worker is
+# not killed mid-drain
+os.environ["JARVIS_DRAIN_TIMEOUT"] = str(
+    min(int(os.getenv("JARVIS_DRAIN_TIMEOUT", str(graceful_timeout))), max(1, graceful_timeout - 5))
+)
+
+_hub = None
+
+# Worker slots: each worker gets the lowest free index and a replacement
+# (crash, max_requests, reload) reuses it, so per-worker files such as the
+# log (jarvis.worker<N>.log) keep stable names instead of one set per pid
+_worker_slots = {}
+
+
+def on_starting(server):
+    """Build components and start the local message bus before forking."""
+    global _hub
+    from backend.main import components
+    components.build()
+
+    url = os.environ.get("JARVIS_MESSAGE_QUEUE", "")
+    if url.startswith("local://"):
+        host, port = parse_local_url(url)
+        _hub = LocalPubSubHub(host, port)
+        _hub.start_in_thread()
+        server.log.info(f"Started local Socket.IO message bus on {host}:{port}")
+
+
+def pre_fork(server, worker):
+    """Assign the worker a slot; the child inherits it through the environment."""
+    used = set(_worker_slots.values())
+    slot = next(index for index in itertools.count() if index not in used)
+    _worker_slots[worker] = slot
+    os.environ["JARVIS_WORKER_ID"] = str(slot)
+
+
+def child_exit(server, worker):
+    """Free the slot of a worker that exited."""
+    _worker_slots.pop(worker, None)
+
+
+def on_exit(server):
+    """Stop the local message bus after all workers have exited."""
+    if _hub is not None:
+        _hub.stop_thread()
+
@@ -1,21 +1,127 @@
+# Imported first so startup timings are measured from here
+from backend.utils.startup_profiler import startup_profiler
+# Load environment variables before the backend modules below read them
+# (error_handler configures logging from LOG_* at import)
+from dotenv import load_dotenv
+load_dotenv()
 import os
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import json
+import math
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from socketio import AsyncServer, ASGIApp
-from dotenv import load_dotenv
 from fastapi import File, UploadFile
+from backend.services.weather import WeatherService
+from backend.services.audio_stream import AudioStreamSession
+from backend.services.speculation import SpeculativeExecutor
+from backend.services.session_recorder import SessionRecorder
 from backend.core.voice_processing import VoiceProcessor
-from backend.utils.error_handler import error_handler
+from backend.core.ai_integration import GeminiAI, MemoryManager
+from backend.core.system_control import SystemController
+from backend.core.components import ComponentRegistry
+from backend.utils.error_handler import error_handler, AdmissionError, WeatherServiceError
+from backend.utils.admission import AdmissionController, AdmissionMiddleware
+from backend.utils.drain import GracefulDrain
+from backend.utils.pubsub import create_client_manager
+from backend.utils.metrics import metrics, timed, LoopLagMonitor
 
-# Load environment variables
-load_dotenv()
+# Production mode runs several workers (see backend/gunicorn_conf.py) that
+# share Socket.IO rooms through a message queue (redis:// or local://)
+workers = int(os.getenv("JARVIS_WORKERS", "1"))
+message_queue_url = os.getenv("JARVIS_MESSAGE_QUEUE")
+
+# Long-polling spreads one session over many HTTP requests, which only works
+# when they all reach the same worker. Websocket-only keeps each session on
+# a single connection, and therefore a single worker, without a sticky proxy.
+default_transports = "websocket" if workers > 1 else "polling,websocket"
+sio_transports = os.getenv("JARVIS_SIO_TRANSPORTS", default_transports).split(",")
+
+# Tracks in-flight requests so a worker can finish them before exiting
+# (gunicorn_conf.py keeps this inside gunicorn's graceful timeout)
+drain = GracefulDrain(timeout=float(os.getenv("JARVIS_DRAIN_TIMEOUT", "25")))
+
+# Samples event loop lag into the jarvis_event_loop_lag_seconds histogram
+loop_lag_monitor = LoopLagMonitor(interval=float(os.getenv("JARVIS_LOOP_LAG_INTERVAL", "0.5")))
+
+# Heavy components are built after the server starts listening (or in the
+# gunicorn master before forking), not at import time
+components = ComponentRegistry(retry_delay=float(os.getenv("JARVIS_COMPONENT_RETRY_DELAY", "5")))
+components.register("voice_processor", lambda: VoiceProcessor({
+    "wake_word": "Hey JARVIS",
+    "stt_pool": admission.pools["stt"]
+}))
+# Optional: voice turns still transcribe without them
+components.register("ai", lambda: GeminiAI({
+    "gemini_api_key": os.getenv("GEMINI_API_KEY"),
+    "api_endpoint": os.getenv("GEMINI_API_ENDPOINT"),
+    "sentiment_analysis": False,
+    "max_concurrency": admission.pools["llm"].limit
+}), required=False)
+components.register("system_controller", lambda: SystemController({
+    "app_paths": json.loads(os.getenv("JARVIS_APP_PATHS", "{}"))
+}), required=False)
+
+# Records streamed voice sessions for replay (benchmarks/replay.py); off
+# unless JARVIS_RECORD_DIR is set
+recorder = SessionRecorder({
+    "directory": os.getenv("JARVIS_RECORD_DIR"),
+    "sample": float(os.getenv("JARVIS_RECORD_SAMPLE", "1.0"))
+})
+
+# Per-client rate limits, concurrency caps per resource class and the
+# upload size cap (per worker process)
+admission = AdmissionController({
+    "http_rate": float(os.getenv("JARVIS_HTTP_RATE", "10")),
+    "event_rate": float(os.getenv("JARVIS_EVENT_RATE", "5")),
+    "pools": {
+        "stt": int(os.getenv("JARVIS_STT_CONCURRENCY", str(os.cpu_count() or 1))),
+        "llm": int(os.getenv("JARVIS_LLM_CONCURRENCY", "8"))
+    },
+    "max_upload_bytes": int(os.getenv("JARVIS_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024))),
+    "max_streams": int(os.getenv("JARVIS_MAX_STREAMS", "32"))
+})
+
+# Starts LLM requests and command lookups from stable partial transcripts,
+# before the user has finished speaking
+speculation = SpeculativeExecutor(components.get, {
+    "enabled": os.getenv("JARVIS_SPECULATION", "True").lower() in ("1", "true", "yes"),
+    "stable_ms": int(os.getenv("JARVIS_SPECULATION_STABLE_MS", "300")),
+    "llm_pool": admission.pools["llm"]
+})
+
+# Cached, coalesced weather lookups; refreshes are pushed over Socket.IO
+weather_service = WeatherService({
+    "api_key": os.getenv("WEATHER_API_KEY"),
+    "base_url": os.getenv("WEATHER_API_URL", "https://api.weatherapi.com/v1"),
+    "ttl": int(os.getenv("WEATHER_CACHE_TTL", "600"))
+})
+default_weather_location = os.getenv("WEATHER_LOCATION", "auto:ip")
+
+@asynccontextmanager
+async def lifespan(app):
+    # SIGTERM drains while the server still listens, then shuts it down
+    drain.install_signal_handler()
+    loop_lag_monitor.start()
+    await weather_service.start()
+    # Not awaited: liveness answers immediately, readiness flips once built
+    components.start_background_build()
+    yield
+    await components.stop()
+    await loop_lag_monitor.stop()
+    await weather_service.stop()
+    if hasattr(sio, "shutdown"):
+        await sio.shutdown()
 
 # Initialize FastAPI app
 fastapi_app = FastAPI(
     title="JARVIS AI Assistant",
     description="A desktop-based virtual assistant inspired by Iron Man's JARVIS",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Configure CORS for frontend communication
@@ -26,6 +132,9 @@ allowed_origins = [
     "http://127.0.0.1:49928"
 ]
 
+# Added before CORS so that rejections still carry CORS headers
+fastapi_app.add_middleware(AdmissionMiddleware, controller=admission)
+
 fastapi_app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
@@ -34,31 +143,198 @@ fastapi_app.add_middleware(
     allow_headers=["*"],
 )
 
+# Socket.IO logs every packet at INFO. Passing named loggers (instead of
+# logger=True, which attaches its own synchronous StreamHandler) routes them
+# through the queued pipeline, where engineio is sampled and rate limited.
+sio_logger = logging.getLogger("socketio.server")
+engineio_logger = logging.getLogger("engineio.server")
+sio_logger.setLevel(os.getenv("SIO_LOG_LEVEL", "INFO"))
+engineio_logger.setLevel(os.getenv("ENGINEIO_LOG_LEVEL", "INFO"))
+
 # Initialize Socket.IO with proper CORS configuration
 sio = AsyncServer(
     async_mode='asgi',
     cors_allowed_origins=allowed_origins,
-    logger=True,
-    engineio_logger=True
+    client_manager=create_client_manager(message_queue_url),
+    transports=sio_transports,
+    logger=sio_logger,
+    engineio_logger=engineio_logger
 )
 
 # Mount FastAPI app to Socket.IO
 app = ASGIApp(sio, fastapi_app)
 
+@fastapi_app.middleware("http")
+async def track_in_flight(request, call_next):
+    drain.begin()
+    try:
+        return await call_next(request)
+    finally:
+        drain.end()
+
+def client_address(environ) -> str:
+    """Client IP of a Socket.IO connection.
+
+    engineio's ASGI driver sets REMOTE_ADDR to 127.0.0.1 for every client;
+    the real peer is in the ASGI scope.
+    """
+    client = (environ.get("asgi.scope") or {}).get("client")
+    return client[0] if client else environ.get("REMOTE_ADDR", "unknown")
+
 # Socket.IO event handlers
 @sio.on('connect')
 async def connect(sid, environ):
+    # Refuse new sessions while draining so clients reconnect to another worker
+    if drain.draining:
+        return False
+    if admission.check_rate("connect", client_address(environ)):
+        return False
     print(f"Client connected: {sid}")
 
 @sio.on('disconnect')
 async def disconnect(sid):
+    audio_sessions.pop(sid, None)
+    conversations.pop(sid, None)
+    speculation.discard(sid)
+    admission.forget(sid)
+    recorder.discard(sid)
     print(f"Client disconnected: {sid}")
 
+async def admit_event(sid) -> bool:
+    """Apply the per-session event rate limit, telling the client when it is hit."""
+    retry_after = admission.check_rate("event", sid)
+    if retry_after:
+        await sio.emit('rate_limited', {"error_code": "RATE_LIMITED", "retry_after": retry_after}, room=sid)
+    return not retry_after
+
 @sio.on('message')
 async def message(sid, data):
+    if not await admit_event(sid):
+        return
     print(f"Message from {sid}: {data}")
     await sio.emit('message', {'response': 'Message received'}, room=sid)
 
+# Streamed voice input: audio_start, then one binary audio_frame per 20 ms
+# frame (see backend/services/audio_stream.py), then audio_end
+audio_sessions = {}
+conversations = {}
+
+@sio.on('audio_start')
+async def audio_start(sid, data=None):
+    data = data or {}
+    if not await admit_event(sid):
+        return
+    # Over long-polling every binary frame is base64-encoded into an HTTP
+    # request; only stream once the connection is on websocket
+    if sio.transport(sid) != 'websocket':
+        await sio.emit('audio_error', {"error": "Audio streaming requires a websocket connection",
+                                       "error_code": "WEBSOCKET_REQUIRED"}, room=sid)
+        return
+    voice_processor = components.get("voice_processor")
+    if voice_processor is None:
+        await sio.emit('audio_error', {"error": "Voice processing is starting up",
+                                       "error_code": "NOT_READY"}, room=sid)
+        return
+    if sid not in audio_sessions and not admission.admit_stream(len(audio_sessions)):
+        await sio.emit('audio_error', {"error": "Too many audio streams; try again shortly",
+                                       "error_code": "OVERLOADED"}, room=sid)
+        return
+    try:
+        recognizer = voice_processor.create_recognizer(data.get("language", "en"))
+        audio_sessions[sid] = AudioStreamSession(recognizer, codec=data.get("codec", "pcm16"),
+                                                 frame_ms=int(data.get("frame_ms", 20)),
+                                                 stt_pool=admission.pools["stt"])
+        memory = conversations.setdefault(sid, MemoryManager())
+        speculation.start(sid, memory.get_conversation_history())
+        recorder.start(sid, {"codec": data.get("codec", "pcm16"), "frame_ms": int(data.get("frame_ms", 20)),
+                             "language": data.get("language", "en")})
+    except Exception as e:
+        error_data = error_handler.log_error(e, {"event": "audio_start"})
+        await sio.emit('audio_error', error_data, room=sid)
+
+@sio.on('audio_frame')
+async def audio_frame(sid, data):
+    session = audio_sessions.get(sid)
+    if session is None or not isinstance(data, (bytes, bytearray)):
+        return
+    # Dropped frames are concealed like network loss by the jitter buffer
+    if admission.check_rate("frame", sid):
+        return
+    recorder.frame(sid, data)
+    try:
+        partial = await session.feed(data)
+    except AdmissionError as e:
+        # Frames shed mid-utterance would leave a gap in the transcript
+        audio_sessions.pop(sid, None)
+        speculation.discard(sid)
+        recorder.discard(sid)
+        await sio.emit('audio_error', {"error": e.message, "error_code": e.error_code,
+                                       "details": e.details}, room=sid)
+        return
+    except Exception as e:
+        # An undecodable payload ends the stream; the client can start a new one
+        audio_sessions.pop(sid, None)
+        speculation.discard(sid)
+        recorder.discard(sid)
+        error_data = error_handler.log_error(e, {"event": "audio_frame"})
+        await sio.emit('audio_error', {**error_data, "error_code": "AUDIO_DECODE_ERROR"}, room=sid)
+        return
+    if partial is not None:
+        speculation.on_partial(sid, partial)
+        recorder.partial(sid, partial)
+        await sio.emit('transcript_partial', {"text": partial}, room=sid)
+
+@sio.on('audio_end')
+async def audio_end(sid, data=None):
+    session = audio_sessions.pop(sid, None)
+    if session is None:
+        return
+    drain.begin()
+    try:
+        text = await session.finish()
+        recorder.final(sid, text)
+        await sio.emit('transcript', {"status": "success" if text else "error", "text": text,
+                                      "stats": session.stats()}, room=sid)
+        if not text:
+            speculation.discard(sid)
+            return
+        result = await speculation.finish(sid, text)
+        if result["type"] == "response" and result["text"]:
+            conversations.setdefault(sid, MemoryManager()).add_interaction(text, result["text"])
+        recorder.result(sid, result)
+        await sio.emit('assistant_response', result, room=sid)
+    except AdmissionError as e:
+        # STT or LLM saturated
+        speculation.discard(sid)
+        await sio.emit('audio_error', {"error": e.message, "error_code": e.error_code,
+                                       "details": e.details}, room=sid)
+    finally:
+        drain.end()
+        await recorder.finish(sid)
+
+def weather_room(location: str) -> str:
+    return f"weather:{WeatherService.normalize_location(location)}"
+
+@sio.on('subscribe_weather')
+async def subscribe_weather(sid, data=None):
+    if not await admit_event(sid):
+        return
+    location = (data.get("location") if isinstance(data, dict) else None) or default_weather_location
+    try:
+        await sio.enter_room(sid, weather_room(location))
+        weather = await weather_service.get_weather(location)
+        await sio.emit('weather_update', weather, room=sid)
+    except WeatherServiceError as e:
+        await sio.emit('weather_update', error_handler.handle_error(e), room=sid)
+
+async def push_weather_update(location: str, weather: dict):
+    # Every worker refreshes the locations its own subscribers asked for, and
+    # websocket sessions stay on one worker, so push to local clients only;
+    # through the message queue each subscriber would get one copy per worker
+    await sio.emit('weather_update', weather, room=weather_room(location), ignore_queue=True)
+
+weather_service.on_update = push_weather_update
+
 # WebSocket routes will be handled by Socket.IO
 
 # WebSocket connection for real-time communication
@@ -67,25 +343,56 @@ async def message(sid, data):
 async def root():
     return {"message": "Welcome to JARVIS AI Assistant API"}
 
-# Health check endpoint
+# Health check endpoints: liveness says the process is serving requests,
+# readiness says it can do real work (components built, not draining)
 @fastapi_app.get("/health")
+@fastapi_app.get("/health/live")
 async def health_check():
     return {"status": "healthy"}
 
+@fastapi_app.get("/health/ready")
+async def readiness_check():
+    status = {"components": components.status(), "errors": components.errors}
+    if drain.draining:
+        return JSONResponse(status_code=503, content={"status": "draining", **status})
+    # "failed": a required component could not be built (retried with
+    # backoff), as opposed to one still loading
+    if components.failed:
+        return JSONResponse(status_code=503, content={"status": "failed", **status})
+    if not components.ready:
+        return JSONResponse(status_code=503, content={"status": "starting", **status})
+    return {"status": "ready", **status}
+
+# Per-import and per-component startup timings
+@fastapi_app.get("/health/startup")
+async def startup_report():
+    return startup_profiler.report()
+
+# Prometheus scrape endpoint (per worker process)
+@fastapi_app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Change a log level at runtime, e.g. PUT /api/logging/level?level=DEBUG&logger=engineio
+# (applies to the worker that serves the request; only from this host)
+@fastapi_app.put("/api/logging/level")
+async def set_log_level(request: Request, level: str, logger: str = None):
+    if request.client is None or request.client.host not in ("127.0.0.1", "::1", "localhost"):
+        return JSONResponse(status_code=403, content={"error": "Log levels can only be changed from localhost"})
+    try:
+        applied = error_handler.logging_pipeline.set_level(level, logger)
+        return {"logger": logger or "root", "level": logging.getLevelName(applied)}
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
 # Weather endpoint
 @fastapi_app.get("/api/weather")
-async def get_weather():
+async def get_weather(location: str = None):
     try:
-        # Mock weather data for demonstration
-        weather_data = {
-            "temperature": 25,
-            "condition": "Sunny",
-            "humidity": 60,
-            "wind_speed": 10
-        }
-        return weather_data
-    except Exception as e:
-        return {"error": str(e)}, 500
+        return await weather_service.get_weather(location or default_weather_location)
+    except WeatherServiceError as e:
+        status_code = {"INVALID_LOCATION": 400, "WEATHER_RATE_LIMITED": 429}.get(e.error_code, 503)
+        return JSONResponse(status_code=status_code, content=error_handler.handle_error(e))
 
 # Import and include API routers
 # These will be implemented as we develop the specific modules
@@ -100,21 +407,27 @@ async def get_weather():
 # app.include_router(system_router, prefix="/api/system", tags=["System"])
 
 # Run the application with uvicorn when executed directly
+# Use `gunicorn -c backend/gunicorn_conf.py backend.main:app` for multiple workers
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
 
-# Initialize VoiceProcessor with default config
-voice_processor = VoiceProcessor({"wake_word": "Hey JARVIS"})
-
 @fastapi_app.post("/api/process_voice")
-async def process_voice(audio_file: UploadFile = File(...)):
+@timed("api.process_voice")
+async def process_voice(request: Request, audio_file: UploadFile = File(...)):
+    voice_processor = components.get("voice_processor")
+    if voice_processor is None:
+        return JSONResponse(status_code=503, content={"error": "Voice processing is starting up", "status": "error"})
+    # Short clips (commands) are served ahead of long ones; the body size was
+    # already capped by AdmissionMiddleware while it streamed in
+    content_length = request.headers.get("content-length")
+    lane = admission.upload_lane(int(content_length) if content_length and content_length.isdigit() else None)
     try:
         # Read the audio data
         audio_data = await audio_file.read()
         
-        # Process the voice input
-        transcribed_text = await voice_processor.process_voice_input(audio_data)
+        # Process the voice input (waits for an STT slot in the upload's lane)
+        transcribed_text = await voice_processor.process_voice_input(audio_data, priority=lane)
         
         if not transcribed_text:
             return {"error": "Could not transcribe audio", "status": "error"}
@@ -123,6 +436,14 @@ async def process_voice(audio_file: UploadFile = File(...)):
             "status": "success",
             "text": transcribed_text
         }
+    except AdmissionError as e:
+        # Not routed through error_handler: logging every shed request adds
+        # load exactly when the server is overloaded
+        return JSONResponse(status_code=503, content={"error": e.message, "error_code": e.error_code,
+                                                      "details": e.details, "status": "error"},
+                            headers={"Retry-After": str(math.ceil(e.retry_after))})
     except Exception as e:
         error_data = error_handler.log_error(e, {"endpoint": "/api/process_voice"})
-        return error_data
\ No newline at end of file
+        return error_data
+
+startup_profiler.checkpoint("app_imported")
@@ -0,0 +1,256 @@
+import asyncio
+import json
+import logging
+import struct
+from typing import Any, Dict, List, Optional
+
+from backend.utils.admission import PRIORITY_INTERACTIVE
+from backend.utils.lazy_import import lazy_module
+from backend.utils.metrics import metrics
+
+opuslib = lazy_module("opuslib", "opuslib")
+
+metrics.describe("jarvis_audio_frames_total", "Streamed audio frames by outcome")
+metrics.describe("jarvis_audio_bytes_total", "Streamed audio bytes received (frame header included)")
+
+# Every frame is one Socket.IO binary attachment: an 8-byte header followed
+# by the payload. Header: codec (u8), flags (u8), duration in ms (u16),
+# sequence number (u32), network byte order.
+FRAME_HEADER = struct.Struct("!BBHI")
+
+CODEC_PCM16 = 0
+CODEC_OPUS = 1
+CODECS = {"pcm16": CODEC_PCM16, "opus": CODEC_OPUS}
+
+SAMPLE_RATE = 16000
+MAX_FRAME_BYTES = 64 * 1024
+# Frame durations a client may declare (header and audio_start frame_ms);
+# concealment allocates silence for the declared duration
+MIN_FRAME_MS = 10
+MAX_FRAME_MS = 60
+
+
+class AudioFrame:
+    """One decoded audio frame header plus its payload."""
+
+    __slots__ = ("codec", "flags", "duration_ms", "seq", "payload")
+
+    def __init__(self, codec: int, flags: int, duration_ms: int, seq: int, payload: bytes):
+        self.codec = codec
+        self.flags = flags
+        self.duration_ms = duration_ms
+        self.seq = seq
+        self.payload = payload
+
+
+def encode_frame(seq: int, payload: bytes, codec: int = CODEC_PCM16, duration_ms: int = 20, flags: int = 0) -> bytes:
+    """Pack a frame for the ``audio_frame`` event."""
+    return FRAME_HEADER.pack(codec, flags, duration_ms, seq & 0xFFFFFFFF) + payload
+
+
+def decode_frame(data: bytes) -> AudioFrame:
+    """Unpack an ``audio_frame`` attachment.
+
+    Raises:
+        ValueError: If the frame is truncated, too large, uses an unknown codec
+            or declares a duration outside MIN_FRAME_MS..MAX_FRAME_MS
+    """
+    if len(data) < FRAME_HEADER.size or len(data) > MAX_FRAME_BYTES:
+        raise ValueError(f"Invalid audio frame of {len(data)} bytes")
+    codec, flags, duration_ms, seq = FRAME_HEADER.unpack_from(data)
+    if codec not in CODECS.values():
+        raise ValueError(f"Unknown audio codec {codec}")
+    if not MIN_FRAME_MS <= duration_ms <= MAX_FRAME_MS:
+        raise ValueError(f"Invalid audio frame duration of {duration_ms} ms")
+    return AudioFrame(codec, flags, duration_ms, seq, bytes(data[FRAME_HEADER.size:]))
+
+
+class JitterBuffer:
+    """Reorders frames by sequence number.
+
+    Frames are released in order. A missing frame is waited for until
+    ``depth`` later frames have arrived, then declared lost and skipped;
+    frames arriving after their slot was released are dropped as late.
+
+    Sequence numbers come from the client, so a gap is only concealed up to
+    ``max_gap`` frames; a larger jump is treated as a resync and the stream
+    continues from the new sequence number without filling the gap.
+    """
+
+    def __init__(self, depth: int = 3, max_gap: Optional[int] = None):
+        """Initialize the buffer.
+
+        Args:
+            depth: Frames to hold back while waiting for a missing one
+                (depth x frame duration is the added latency on loss)
+            max_gap: Most lost frames concealed per gap (default: depth)
+        """
+        self.depth = depth
+        self.max_gap = depth if max_gap is None else max_gap
+        self.next_seq: Optional[int] = None
+        self.pending: Dict[int, AudioFrame] = {}
+        self.stats = {"received": 0, "late": 0, "duplicate": 0, "lost": 0, "resync": 0}
+
+    def _skip_to(self, seq: int) -> List[None]:
+        """Advance next_seq to ``seq``, returning a None per concealed frame."""
+        lost = seq - self.next_seq
+        self.next_seq = seq
+        if lost > self.max_gap:
+            self.stats["resync"] += 1
+            return []
+        self.stats["lost"] += lost
+        return [None] * lost
+
+    def push(self, frame: AudioFrame) -> List[Optional[AudioFrame]]:
+        """Add a frame and return the frames now ready to play, in order.
+
+        A None entry marks a lost frame, so the caller can conceal it.
+        """
+        self.stats["received"] += 1
+        if self.next_seq is None:
+            self.next_seq = frame.seq
+        if frame.seq < self.next_seq:
+            self.stats["late"] += 1
+            return []
+        if frame.seq in self.pending:
+            self.stats["duplicate"] += 1
+            return []
+        self.pending[frame.seq] = frame
+
+        ready: List[Optional[AudioFrame]] = []
+        while self.pending:
+            if self.next_seq in self.pending:
+                ready.append(self.pending.pop(self.next_seq))
+                self.next_seq += 1
+            elif len(self.pending) > self.depth:
+                # Waited long enough for next_seq; skip to the oldest pending frame
+                ready.extend(self._skip_to(min(self.pending)))
+            else:
+                break
+        return ready
+
+    def flush(self) -> List[Optional[AudioFrame]]:
+        """Release everything still held, marking gaps as lost."""
+        ready: List[Optional[AudioFrame]] = []
+        for seq in sorted(self.pending):
+            ready.extend(self._skip_to(seq))
+            ready.append(self.pending[seq])
+            self.next_seq = seq + 1
+        self.pending.clear()
+        return ready
+
+
+class AudioStreamSession:
+    """One client's streamed utterance: frames in, transcripts out.
+
+    Decoded PCM is fed to a streaming Vosk recognizer as frames arrive, so a
+    partial transcript is available while the user is still speaking and the
+    final result needs no second pass over the audio.
+    """
+
+    def __init__(self, recognizer, codec: str = "pcm16", jitter_depth: int = 3, frame_ms: int = 20,
+                 stt_pool=None):
+        """Initialize the session.
+
+        Args:
+            recognizer: A fresh Vosk recognizer (VoiceProcessor.create_recognizer)
+            codec: "pcm16" (raw little-endian int16) or "opus"
+            jitter_depth: Frames held back while waiting for a missing one
+            frame_ms: Expected frame duration, used to conceal lost frames
+                (clamped to MIN_FRAME_MS..MAX_FRAME_MS)
+            stt_pool: ResourcePool shared with uploaded clips; each batch of
+                frames is recognized under an interactive-lane slot
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported codec: {codec}")
+        self.codec = CODECS[codec]
+        self.recognizer = recognizer
+        self.stt_pool = stt_pool
+        self.jitter = JitterBuffer(jitter_depth)
+        self.frame_ms = min(max(frame_ms, MIN_FRAME_MS), MAX_FRAME_MS)
+        self.decoder = opuslib.Decoder(SAMPLE_RATE, 1) if self.codec == CODEC_OPUS else None
+        self.bytes_received = 0
+        self.segments: List[str] = []
+        self.partial = ""
+        self._lock = asyncio.Lock()
+
+    def _decode(self, frame: Optional[AudioFrame]) -> bytes:
+        duration_ms = frame.duration_ms if frame else self.frame_ms
+        samples = SAMPLE_RATE * duration_ms // 1000
+        if frame is None:
+            if self.decoder is not None:
+                # Opus packet loss concealment
+                return self.decoder.decode(b"", samples, decode_fec=False)
+            return b"\x00\x00" * samples
+        if self.decoder is not None:
+            return self.decoder.decode(frame.payload, samples)
+        return frame.payload
+
+    def _accept(self, frames: List[Optional[AudioFrame]]) -> str:
+        pcm = b"".join(self._decode(frame) for frame in frames)
+        if self.recognizer.AcceptWaveform(pcm):
+            # Vosk closed a segment (pause in speech); Result() consumes it
+            text = json.loads(self.recognizer.Result()).get("text", "")
+            if text:
+                self.segments.append(text)
+            current = ""
+        else:
+            current = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return " ".join(self.segments + [current]).strip()
+
+    async def _recognize(self, func, *args):
+        # Recognition is CPU-bound; keep it off the event loop
+        if self.stt_pool is not None:
+            return await self.stt_pool.run_in_executor(PRIORITY_INTERACTIVE, func, *args)
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def feed(self, data: bytes) -> Optional[str]:
+        """Add one ``audio_frame`` attachment.
+
+        Returns:
+            str: The new partial transcript if it changed, else None
+
+        Raises:
+            AdmissionError: If the STT pool is saturated and the frames were shed
+            Exception: Whatever the Opus decoder raises for a corrupt payload
+        """
+        try:
+            frame = decode_frame(data)
+        except ValueError as e:
+            metrics.inc("jarvis_audio_frames_total", outcome="invalid")
+            logging.warning(f"Dropping audio frame: {e}")
+            return None
+        if frame.codec != self.codec:
+            metrics.inc("jarvis_audio_frames_total", outcome="invalid")
+            return None
+
+        self.bytes_received += len(data)
+        metrics.inc("jarvis_audio_bytes_total", len(data))
+        ready = self.jitter.push(frame)
+        metrics.inc("jarvis_audio_frames_total", outcome="accepted" if ready else "buffered")
+        if not ready:
+            return None
+
+        async with self._lock:
+            partial = await self._recognize(self._accept, ready)
+        if partial and partial != self.partial:
+            self.partial = partial
+            return partial
+        return None
+
+    async def finish(self) -> str:
+        """Flush buffered frames and return the final transcript.
+
+        Raises:
+            AdmissionError: If the STT pool is saturated and the request was shed
+        """
+        async with self._lock:
+            remaining = self.jitter.flush()
+            if remaining:
+                await self._recognize(self._accept, remaining)
+            result = await self._recognize(self.recognizer.FinalResult)
+        return " ".join(self.segments + [json.loads(result).get("text", "")]).strip()
+
+    def stats(self) -> Dict[str, Any]:
+        """Jitter buffer counters and bytes received."""
+        return {**self.jitter.stats, "bytes": self.bytes_received}
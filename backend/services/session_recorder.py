@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import struct
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.utils.metrics import metrics
+
+metrics.describe("jarvis_recorded_sessions_total", "Voice sessions written for replay, by outcome")
+
+# A recording is MAGIC followed by records: kind (u8), milliseconds since
+# audio_start (u32) and payload length (u32), network byte order, then the
+# payload. Frames are stored exactly as received (8-byte frame header plus
+# PCM16 or Opus), so a replay sends the same bytes.
+MAGIC = b"JVR1"
+RECORD_HEADER = struct.Struct("!BII")
+
+META = 0
+FRAME = 1
+PARTIAL = 2
+FINAL = 3
+RESULT = 4
+
+
+class Recording:
+    """A voice session read back from a recording file."""
+
+    def __init__(self):
+        self.meta: Dict[str, Any] = {}
+        self.frames: List[Tuple[int, bytes]] = []
+        self.partials: List[Tuple[int, str]] = []
+        self.final: Optional[Tuple[int, str]] = None
+        self.results: List[Tuple[int, Dict[str, Any]]] = []
+
+    @property
+    def duration_ms(self) -> int:
+        return self.frames[-1][0] if self.frames else 0
+
+
+def encode_record(kind: int, offset_ms: int, payload: bytes) -> bytes:
+    return RECORD_HEADER.pack(kind, offset_ms, len(payload)) + payload
+
+
+def read_recording(path: str) -> Recording:
+    """Parse a recording file.
+
+    Raises:
+        ValueError: If the file is not a recording or is truncated
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a voice session recording")
+    recording = Recording()
+    position = len(MAGIC)
+    while position < len(data):
+        if position + RECORD_HEADER.size > len(data):
+            raise ValueError(f"{path} is truncated")
+        kind, offset_ms, length = RECORD_HEADER.unpack_from(data, position)
+        position += RECORD_HEADER.size
+        payload = data[position:position + length]
+        if len(payload) != length:
+            raise ValueError(f"{path} is truncated")
+        position += length
+        if kind == META:
+            recording.meta = json.loads(payload)
+        elif kind == FRAME:
+            recording.frames.append((offset_ms, payload))
+        elif kind == PARTIAL:
+            recording.partials.append((offset_ms, payload.decode()))
+        elif kind == FINAL:
+            recording.final = (offset_ms, payload.decode())
+        elif kind == RESULT:
+            recording.results.append((offset_ms, json.loads(payload)))
+    return recording
+
+
+def write_recording(path: str, meta: Dict[str, Any], frames: List[Tuple[int, bytes]],
+                    final: Optional[str] = None):
+    """Write a recording from frames generated offline (e.g. benchmark fixtures).
+
+    Args:
+        path: Output file
+        meta: audio_start parameters (codec, frame_ms, language)
+        frames: (milliseconds since start, encoded frame) pairs
+        final: Expected final transcript, if known
+    """
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(encode_record(META, 0, json.dumps(meta).encode()))
+        for offset_ms, frame in frames:
+            f.write(encode_record(FRAME, offset_ms, frame))
+        if final is not None:
+            f.write(encode_record(FINAL, frames[-1][0] if frames else 0, final.encode()))
+
+
+class _SessionBuffer:
+    __slots__ = ("started", "chunks", "size", "truncated")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.chunks: List[bytes] = [MAGIC]
+        self.size = len(MAGIC)
+        self.truncated = False
+
+
+class SessionRecorder:
+    """Records streamed voice sessions (audio frames with their timing,
+    partial and final transcripts, and the turn's result) for offline
+    replay with ``python -m benchmarks.replay``.
+
+    Sessions are held in memory while they run and written to one file
+    each, off the event loop, when they end.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the recorder with configuration settings.
+
+        Args:
+            config: Dictionary containing configuration parameters
+                - directory: Where recordings are written; recording is off without one
+                - sample: Fraction of sessions to record (default: 1.0)
+                - max_bytes: Per-session size limit; later frames are dropped (default: 16 MB)
+        """
+        self.config = config
+        self.directory = config.get("directory")
+        self.sample = config.get("sample", 1.0)
+        self.max_bytes = config.get("max_bytes", 16 * 1024 * 1024)
+        self.sessions: Dict[str, _SessionBuffer] = {}
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def start(self, sid: str, meta: Dict[str, Any]):
+        """Begin recording a session (subject to sampling).
+
+        Args:
+            sid: Socket.IO session id
+            meta: audio_start parameters (codec, frame_ms, language)
+        """
+        self.sessions.pop(sid, None)
+        if not self.enabled or random.random() >= self.sample:
+            return
+        self.sessions[sid] = _SessionBuffer()
+        self._add(sid, META, json.dumps({**meta, "recorded_at": time.time()}).encode())
+
+    def _add(self, sid: str, kind: int, payload: bytes):
+        buffer = self.sessions.get(sid)
+        if buffer is None:
+            return
+        if buffer.size + RECORD_HEADER.size + len(payload) > self.max_bytes:
+            buffer.truncated = True
+            return
+        offset_ms = int((time.perf_counter() - buffer.started) * 1000)
+        record = encode_record(kind, offset_ms, payload)
+        buffer.chunks.append(record)
+        buffer.size += len(record)
+
+    def frame(self, sid: str, data: bytes):
+        self._add(sid, FRAME, bytes(data))
+
+    def partial(self, sid: str, text: str):
+        self._add(sid, PARTIAL, text.encode())
+
+    def final(self, sid: str, text: str):
+        self._add(sid, FINAL, text.encode())
+
+    def result(self, sid: str, result: Dict[str, Any]):
+        self._add(sid, RESULT, json.dumps(result).encode())
+
+    async def finish(self, sid: str) -> Optional[str]:
+        """Write a session's recording.
+
+        Returns:
+            Optional[str]: Path of the file, or None if the session was not recorded
+        """
+        buffer = self.sessions.pop(sid, None)
+        if buffer is None:
+            return None
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{sid}.jvr")
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._write, path, buffer.chunks)
+        except OSError as e:
+            logging.error(f"Failed to write session recording {path}: {e}")
+            metrics.inc("jarvis_recorded_sessions_total", outcome="error")
+            return None
+        metrics.inc("jarvis_recorded_sessions_total", outcome="truncated" if buffer.truncated else "complete")
+        return path
+
+    @staticmethod
+    def _write(path: str, chunks: List[bytes]):
+        with open(path, "wb") as f:
+            f.writelines(chunks)
+
+    def discard(self, sid: str):
+        """Drop a session that ended without a final transcript."""
+        self.sessions.pop(sid, None)
+
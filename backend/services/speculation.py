@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from backend.core.commands import Command, parse_command
+from backend.utils.admission import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from backend.utils.metrics import metrics
+
+metrics.describe("jarvis_speculation_total", "Speculative LLM requests by outcome")
+metrics.describe("jarvis_speculation_saved_seconds_total",
+                 "LLM time overlapped with speech by committed speculative requests")
+metrics.describe("jarvis_speculation_wasted_seconds_total", "LLM time spent on cancelled speculative requests")
+metrics.describe("jarvis_speculation_prefetch_total", "Speculative warm-ups and command target lookups")
+
+
+def normalize_transcript(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _consume(future: asyncio.Future):
+    # Prefetches are best effort; keep their errors out of "never retrieved" warnings
+    if not future.cancelled() and future.exception() is not None:
+        logging.warning(f"Speculative prefetch failed: {future.exception()}")
+
+
+class SpeculativeTurn:
+    """Speculation state for one streamed utterance."""
+
+    __slots__ = ("context", "partial", "timer", "prompt", "task", "started_at", "done_at", "prefetched")
+
+    def __init__(self, context: Optional[list] = None):
+        self.context = context
+        self.partial = ""
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.prompt: Optional[str] = None
+        self.task: Optional[asyncio.Future] = None
+        self.started_at = 0.0
+        self.done_at: Optional[float] = None
+        self.prefetched: Set[Tuple[str, str]] = set()
+
+
+class SpeculativeExecutor:
+    """Runs a voice turn's work, starting it from partial transcripts.
+
+    While the user is speaking:
+
+    - the Gemini connection is warmed when the stream starts;
+    - a partial hypothesis unchanged for ``stable_ms`` is treated as a likely
+      final: a SystemController target it names is resolved ahead of time,
+      otherwise a speculative LLM request is sent with it.
+
+    When the final transcript arrives a matching speculative request is
+    committed (its answer is used) and anything else is cancelled. LLM time
+    overlapped with speech counts as saved, time spent on cancelled
+    hypotheses as wasted.
+    """
+
+    def __init__(self, get_component: Callable[[str], Any], config: Dict[str, Any]):
+        """Initialize the executor.
+
+        Args:
+            get_component: Returns a built component by name or None
+                (ComponentRegistry.get); "ai" and "system_controller" are used
+            config: Dictionary containing configuration parameters
+                - enabled: Speculate on partial transcripts (default: True)
+                - stable_ms: How long a partial must stay unchanged (default: 300)
+                - min_words: Shortest partial worth an LLM request (default: 3)
+                - llm_pool: ResourcePool capping concurrent LLM requests;
+                  speculative requests only use a free batch slot and are
+                  skipped when there is none, final ones wait in the
+                  interactive lane
+        """
+        self.get_component = get_component
+        self.enabled = config.get("enabled", True)
+        self.stable_ms = config.get("stable_ms", 300)
+        self.min_words = config.get("min_words", 3)
+        self.llm_pool = config.get("llm_pool")
+        self.turns: Dict[str, SpeculativeTurn] = {}
+        self.stats = {"started": 0, "committed": 0, "cancelled": 0, "saved_s": 0.0, "wasted_s": 0.0}
+
+    def start(self, sid: str, context: Optional[list] = None):
+        """Begin a turn for a session.
+
+        Args:
+            sid: Socket.IO session id
+            context: Conversation history passed to the LLM
+        """
+        self.discard(sid)
+        self.turns[sid] = SpeculativeTurn(context)
+        ai = self.get_component("ai")
+        if self.enabled and ai is not None:
+            asyncio.ensure_future(ai.warm()).add_done_callback(_consume)
+            metrics.inc("jarvis_speculation_prefetch_total", kind="llm_warm")
+
+    def on_partial(self, sid: str, text: str):
+        """Record a new partial transcript; speculation starts once it is stable."""
+        turn = self.turns.get(sid)
+        if turn is None or not self.enabled:
+            return
+        turn.partial = text
+        if turn.timer is not None:
+            turn.timer.cancel()
+        loop = asyncio.get_running_loop()
+        turn.timer = loop.call_later(self.stable_ms / 1000, self._on_stable, sid, turn, text)
+
+    def _parse(self, text: str) -> Optional[Command]:
+        controller = self.get_component("system_controller")
+        if controller is None:
+            return None
+        return parse_command(text, controller.app_paths)
+
+    def _on_stable(self, sid: str, turn: SpeculativeTurn, text: str):
+        turn.timer = None
+        if self.turns.get(sid) is not turn or turn.partial != text:
+            return
+        prompt = normalize_transcript(text)
+        if prompt == turn.prompt:
+            return
+
+        command = self._parse(prompt)
+        if command is not None:
+            self._prefetch(turn, command)
+            return
+        ai = self.get_component("ai")
+        if ai is None or len(prompt.split()) < self.min_words:
+            return
+
+        # One speculative request per turn: a newer stable hypothesis replaces it
+        self._cancel(turn)
+        if self.llm_pool is not None and not self.llm_pool.try_acquire(PRIORITY_BATCH):
+            # Never let guesses compete with real requests for a busy LLM
+            metrics.inc("jarvis_speculation_total", outcome="shed")
+            return
+        turn.prompt = prompt
+        turn.started_at = time.perf_counter()
+        turn.done_at = None
+        task = asyncio.ensure_future(ai.generate(text, turn.context))
+        if self.llm_pool is not None:
+            # Released however the task ends, even if cancelled before it ran.
+            # A cancelled generate() only ends once its SDK call has (see
+            # GeminiAI._call), so the slot covers the real upstream work.
+            task.add_done_callback(lambda _: self.llm_pool.release())
+
+        def on_done(task: asyncio.Future):
+            if turn.task is task:
+                turn.done_at = time.perf_counter()
+
+        task.add_done_callback(on_done)
+        turn.task = task
+        self.stats["started"] += 1
+        metrics.inc("jarvis_speculation_total", outcome="started")
+
+    async def _generate(self, ai, text: str, context: Optional[list]) -> str:
+        if self.llm_pool is None:
+            return await ai.generate(text, context)
+        async with self.llm_pool.slot(PRIORITY_INTERACTIVE):
+            return await ai.generate(text, context)
+
+    def _prefetch(self, turn: SpeculativeTurn, command: Command):
+        if command in turn.prefetched:
+            return
+        turn.prefetched.add(command)
+        controller = self.get_component("system_controller")
+        loop = asyncio.get_running_loop()
+        # Process table walks are slow; keep them off the event loop
+        future = loop.run_in_executor(None, controller.prefetch, command.action, command.target)
+        future.add_done_callback(_consume)
+        metrics.inc("jarvis_speculation_prefetch_total", kind="command")
+
+    def _cancel(self, turn: SpeculativeTurn):
+        if turn.task is None:
+            return
+        # Cancelling stops waiting for the answer; an SDK call already in
+        # flight still runs to completion and keeps its LLM slot until then,
+        # so the time wasted is counted once the task has really ended
+        started_at, done_at = turn.started_at, turn.done_at
+
+        def account(_):
+            wasted = (done_at or time.perf_counter()) - started_at
+            self.stats["wasted_s"] += wasted
+            metrics.inc("jarvis_speculation_wasted_seconds_total", wasted)
+
+        turn.task.add_done_callback(account)
+        turn.task.cancel()
+        turn.task = None
+        turn.prompt = None
+        self.stats["cancelled"] += 1
+        metrics.inc("jarvis_speculation_total", outcome="cancelled")
+
+    async def finish(self, sid: str, text: str) -> Dict[str, Any]:
+        """Complete a turn with its final transcript.
+
+        Args:
+            sid: Socket.IO session id
+            text: Final transcript
+
+        Returns:
+            Dict: {"type": "command", "action", "target", "success"} for a
+            SystemController command, else {"type": "response", "text",
+            "speculative"} with the LLM answer (text is None without an LLM)
+
+        Raises:
+            AdmissionError: If the LLM is saturated and the request was shed
+        """
+        turn = self.turns.pop(sid, None) or SpeculativeTurn()
+        if turn.timer is not None:
+            turn.timer.cancel()
+        prompt = normalize_transcript(text)
+
+        command = self._parse(prompt)
+        if command is not None:
+            self._cancel(turn)
+            controller = self.get_component("system_controller")
+            loop = asyncio.get_running_loop()
+            success = await loop.run_in_executor(None, getattr(controller, command.action), command.target)
+            return {"type": "command", "action": command.action, "target": command.target, "success": success}
+
+        if turn.task is not None and turn.prompt == prompt:
+            final_at = time.perf_counter()
+            saved = min(final_at, turn.done_at or final_at) - turn.started_at
+            self.stats["committed"] += 1
+            self.stats["saved_s"] += saved
+            metrics.inc("jarvis_speculation_total", outcome="committed")
+            metrics.inc("jarvis_speculation_saved_seconds_total", saved)
+            return {"type": "response", "text": await turn.task, "speculative": True}
+
+        self._cancel(turn)
+        ai = self.get_component("ai")
+        if ai is None:
+            return {"type": "response", "text": None, "speculative": False}
+        return {"type": "response", "text": await self._generate(ai, text, turn.context), "speculative": False}
+
+    def discard(self, sid: str):
+        """Drop a session's turn (disconnect, restarted stream), cancelling its speculation."""
+        turn = self.turns.pop(sid, None)
+        if turn is None:
+            return
+        if turn.timer is not None:
+            turn.timer.cancel()
+        self._cancel(turn)
@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.utils.admission import TokenBucket
+from backend.utils.error_handler import WeatherServiceError
+from backend.utils.lazy_import import lazy_module
+from backend.utils.metrics import metrics, timed
+
+httpx = lazy_module("httpx", "httpx")
+
+metrics.describe("jarvis_weather_requests_total", "Weather lookups by cache outcome")
+metrics.describe("jarvis_weather_upstream_calls_total", "HTTP calls made to the weather provider")
+
+# City names (letters and combining marks of any script), "lat,lon",
+# postcodes, "auto:ip"
+MAX_LOCATION_LENGTH = 100
+LOCATION_PUNCTUATION = frozenset(" ,.'-:")
+
+
+class CacheEntry:
+    """Cached weather for one location."""
+
+    __slots__ = ("data", "fetched_at", "last_requested")
+
+    def __init__(self, data: Dict[str, Any], fetched_at: float):
+        self.data = data
+        self.fetched_at = fetched_at
+        self.last_requested = fetched_at
+
+
+class WeatherService:
+    """Fetches current weather with a per-location cache in front of the
+    provider, so client polling does not turn into upstream calls.
+
+    - Fresh entries (younger than ``ttl``) are served from the cache.
+    - Stale entries (younger than ``stale_ttl``) are served immediately while
+      one background refresh runs (stale-while-revalidate).
+    - Concurrent misses for a location share a single upstream request.
+    - Locations requested recently are refreshed ahead of expiry by a
+      background task, and every refresh is pushed through ``on_update``.
+
+    Every client-supplied location is a cache key and an upstream call, so
+    locations are validated, at most ``max_locations`` are cached (least
+    recently used first out) and fetches for uncached locations share a
+    budget of ``new_location_rate`` per second across all clients.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the weather service with configuration settings.
+
+        Args:
+            config: Dictionary containing configuration parameters
+                - api_key: WeatherAPI key; without one mock data is returned
+                - base_url: Provider base URL (default: WeatherAPI v1)
+                - ttl: Seconds an entry is fresh (default: 600)
+                - stale_ttl: Seconds a stale entry may still be served (default: 3600)
+                - idle_ttl: Stop refreshing a location not requested for this long (default: 1800)
+                - timeout: Upstream request timeout in seconds (default: 5)
+                - max_connections: Connection pool size (default: 10)
+                - max_locations: Locations kept in the cache (default: 256)
+                - new_location_rate: Fetches per second for uncached locations (default: 0.1)
+                - new_location_burst: Uncached-location fetches allowed at once (default: 20)
+        """
+        self.config = config
+        self.api_key = config.get("api_key")
+        self.base_url = config.get("base_url", "https://api.weatherapi.com/v1")
+        self.ttl = config.get("ttl", 600)
+        self.stale_ttl = config.get("stale_ttl", 3600)
+        self.idle_ttl = config.get("idle_ttl", 1800)
+        self.timeout = config.get("timeout", 5.0)
+        self.max_connections = config.get("max_connections", 10)
+        self.max_locations = config.get("max_locations", 256)
+        self.new_locations = TokenBucket(config.get("new_location_rate", 0.1), config.get("new_location_burst", 20))
+
+        self.cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.upstream_calls = 0
+        self.on_update: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None
+        self.client = None
+        self.refresh_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def normalize_location(location: str) -> str:
+        """Cache key for a location.
+
+        Raises:
+            WeatherServiceError: If the location is not a plausible query
+        """
+        key = " ".join(location.lower().split()) if isinstance(location, str) else ""
+        if not 0 < len(key) <= MAX_LOCATION_LENGTH or not all(
+                ch in LOCATION_PUNCTUATION or unicodedata.category(ch)[0] in "LMN" for ch in key):
+            raise WeatherServiceError(
+                "Invalid location",
+                error_code="INVALID_LOCATION",
+                details={"location": str(location)[:100]}
+            )
+        return key
+
+    def _get_client(self):
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+            )
+        return self.client
+
+    async def start(self):
+        """Start background refreshing (the HTTP client is opened on first use)."""
+        if self.refresh_task is None:
+            self.refresh_task = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop(self):
+        """Stop background refreshing and close the HTTP client."""
+        if self.refresh_task is not None:
+            self.refresh_task.cancel()
+            try:
+                await self.refresh_task
+            except asyncio.CancelledError:
+                pass
+            self.refresh_task = None
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def get_weather(self, location: str) -> Dict[str, Any]:
+        """Get current weather for a location.
+
+        Args:
+            location: City name, "lat,lon" or any query the provider accepts
+
+        Returns:
+            Dict: temperature, condition, humidity, wind_speed, location, updated_at
+
+        Raises:
+            WeatherServiceError: INVALID_LOCATION, WEATHER_RATE_LIMITED (too
+                many new locations) or WEATHER_UNAVAILABLE
+        """
+        key = self.normalize_location(location)
+        now = time.monotonic()
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.move_to_end(key)
+            entry.last_requested = now
+            age = now - entry.fetched_at
+            if age < self.ttl:
+                metrics.inc("jarvis_weather_requests_total", outcome="hit")
+                return entry.data
+            if age < self.stale_ttl:
+                metrics.inc("jarvis_weather_requests_total", outcome="stale")
+                self._refresh_in_background(key)
+                return entry.data
+
+        if entry is None and key not in self.in_flight:
+            retry_after = self.new_locations.take()
+            if retry_after:
+                metrics.inc("jarvis_weather_requests_total", outcome="rate_limited")
+                raise WeatherServiceError(
+                    "Too many new weather locations; try again shortly",
+                    error_code="WEATHER_RATE_LIMITED",
+                    details={"location": key, "retry_after": round(retry_after, 1)}
+                )
+        metrics.inc("jarvis_weather_requests_total", outcome="miss")
+        try:
+            return await self._fetch_coalesced(key)
+        except WeatherServiceError:
+            # Anything cached beats an error, however old
+            if entry is not None:
+                return entry.data
+            raise
+
+    def _refresh_in_background(self, key: str):
+        if key in self.in_flight:
+            return
+        task = asyncio.ensure_future(self._fetch_coalesced(key))
+        # Errors are logged in _fetch; keep them out of "never retrieved" warnings
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _fetch_coalesced(self, key: str) -> Dict[str, Any]:
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(key))
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # Shield so one caller giving up does not cancel the shared request
+        return await asyncio.shield(future)
+
+    @timed("weather.fetch")
+    async def _fetch(self, key: str) -> Dict[str, Any]:
+        if not self.api_key:
+            data = self._mock_weather(key)
+        else:
+            self.upstream_calls += 1
+            metrics.inc("jarvis_weather_upstream_calls_total")
+            try:
+                response = await self._get_client().get("/current.json", params={"key": self.api_key, "q": key})
+                response.raise_for_status()
+                data = self._parse(response.json())
+            except Exception as e:
+                logging.error(f"Weather request for {key!r} failed: {e}")
+                raise WeatherServiceError(
+                    "Weather data is currently unavailable",
+                    error_code="WEATHER_UNAVAILABLE",
+                    details={"location": key}
+                ) from e
+
+        previous = self.cache.get(key)
+        entry = CacheEntry(data, time.monotonic())
+        if previous is not None:
+            entry.last_requested = previous.last_requested
+        self.cache[key] = entry
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_locations:
+            self.cache.popitem(last=False)
+
+        if self.on_update is not None and (previous is None or previous.data != data):
+            # Push without holding up the callers waiting on this fetch
+            asyncio.ensure_future(self._push_update(key, data))
+        return data
+
+    async def _push_update(self, key: str, data: Dict[str, Any]):
+        try:
+            await self.on_update(key, data)
+        except Exception as e:
+            logging.error(f"Weather update push failed: {e}")
+
+    async def _refresh_loop(self):
+        # Refresh entries shortly before they go stale, as long as someone
+        # asked for them recently
+        interval = max(1.0, self.ttl * 0.1)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for key, entry in list(self.cache.items()):
+                if now - entry.last_requested > self.idle_ttl:
+                    if now - entry.fetched_at > self.stale_ttl:
+                        del self.cache[key]
+                    continue
+                if now - entry.fetched_at >= self.ttl * 0.9:
+                    self._refresh_in_background(key)
+
+    @staticmethod
+    def _parse(payload: Dict[str, Any]) -> Dict[str, Any]:
+        current = payload["current"]
+        location = payload.get("location", {})
+        return {
+            "temperature": current["temp_c"],
+            "condition": current["condition"]["text"],
+            "humidity": current["humidity"],
+            "wind_speed": current["wind_kph"],
+            "location": location.get("name"),
+            "updated_at": current.get("last_updated"),
+        }
+
+    @staticmethod
+    def _mock_weather(key: str) -> Dict[str, Any]:
+        # Mock weather data for when no API key is configured
+        return {
+            "temperature": 25,
+            "condition": "Sunny",
+            "humidity": 60,
+            "wind_speed": 10,
+            "location": key,
+            "updated_at": None,
+        }
@@ -0,0 +1,396 @@
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.utils.error_handler import AdmissionError
+from backend.utils.metrics import metrics
+
+metrics.describe("jarvis_admission_rejected_total", "Requests, events and uploads shed by admission control")
+metrics.describe("jarvis_admission_in_use", "Slots in use per resource class")
+metrics.describe("jarvis_admission_queued", "Requests waiting for a slot per resource class")
+metrics.describe("jarvis_admission_wait_seconds", "Time spent waiting for a slot per resource class and lane")
+
+# Priority lanes, served in this order when a resource class is saturated
+PRIORITY_INTERACTIVE = 0  # wake word, short commands, final LLM answers
+PRIORITY_NORMAL = 1
+PRIORITY_BATCH = 2  # long uploads, speculative LLM requests
+LANE_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_NORMAL: "normal", PRIORITY_BATCH: "batch"}
+
+
+class TokenBucket:
+    """Allows ``rate`` operations per second with bursts of up to ``burst``."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens.
+
+        Returns:
+            float: 0 if allowed, else seconds until enough tokens are available
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets keyed by client (IP address or Socket.IO sid).
+
+    At most ``max_keys`` buckets are kept; the least recently used is
+    evicted, which at worst gives that client a fresh burst.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        """Initialize the limiter.
+
+        Args:
+            rate: Sustained operations per second per key
+            burst: Operations allowed at once after a quiet period
+            max_keys: Buckets kept before evicting the least recently used
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def check(self, key: str, cost: float = 1.0) -> float:
+        """Take tokens for ``key``; returns 0 if allowed, else the retry delay."""
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.rate, self.burst)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+        return bucket.take(cost)
+
+    def forget(self, key: str):
+        self.buckets.pop(key, None)
+
+
+class ResourcePool:
+    """Concurrency cap for one resource class (STT, LLM).
+
+    Waiters are served by priority lane, first come first served within a
+    lane. ``reserved`` slots are only handed to interactive work, so batch
+    jobs can never occupy the whole pool and a short command at most waits
+    for another short command. Requests are shed rather than queued
+    without bound: when ``max_queue`` requests already wait, or after
+    waiting ``queue_timeout`` seconds.
+    """
+
+    def __init__(self, name: str, limit: int, reserved: int = 1, max_queue: int = 32, queue_timeout: float = 10.0):
+        """Initialize the pool.
+
+        Args:
+            name: Resource class, used in metrics and errors
+            limit: Maximum concurrent holders
+            reserved: Slots only interactive work may take (capped at limit - 1)
+            max_queue: Maximum waiters before new requests are shed
+            queue_timeout: Seconds a request may wait for a slot
+        """
+        self.name = name
+        self.limit = limit
+        self.reserved = max(0, min(reserved, limit - 1))
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_use = 0
+        self.waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+
+    def _capacity(self, priority: int) -> int:
+        return self.limit if priority == PRIORITY_INTERACTIVE else self.limit - self.reserved
+
+    def _first_waiter(self) -> Optional[Tuple[int, int, asyncio.Future]]:
+        # A waiter cancelled but not yet removed by acquire() is skipped
+        while self.waiters and self.waiters[0][2].done():
+            heapq.heappop(self.waiters)
+        return self.waiters[0] if self.waiters else None
+
+    def _remove_waiter(self, entry: Tuple[int, int, asyncio.Future]):
+        # Timed-out and cancelled waiters leave the queue at once, so
+        # max_queue and the queued gauge only count live ones
+        try:
+            self.waiters.remove(entry)
+        except ValueError:
+            return
+        heapq.heapify(self.waiters)
+
+    def _update_gauges(self):
+        metrics.set("jarvis_admission_in_use", self.in_use, resource=self.name)
+        metrics.set("jarvis_admission_queued", len(self.waiters), resource=self.name)
+
+    def _shed(self, priority: int, reason: str) -> AdmissionError:
+        metrics.inc("jarvis_admission_rejected_total", resource=self.name, lane=LANE_NAMES[priority], reason=reason)
+        return AdmissionError(
+            f"The server is busy ({self.name}); try again shortly",
+            error_code="OVERLOADED",
+            retry_after=1.0,
+            details={"resource": self.name, "reason": reason}
+        )
+
+    def try_acquire(self, priority: int = PRIORITY_NORMAL) -> bool:
+        """Take a slot if one is free and nobody of equal or higher priority waits."""
+        first = self._first_waiter()
+        if self.in_use >= self._capacity(priority) or (first is not None and first[0] <= priority):
+            return False
+        self.in_use += 1
+        self._update_gauges()
+        return True
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL):
+        """Wait for a slot.
+
+        Raises:
+            AdmissionError: If the queue is full or the wait timed out
+        """
+        if self.try_acquire(priority):
+            return
+        if len(self.waiters) >= self.max_queue:
+            raise self._shed(priority, "queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._order), future)
+        heapq.heappush(self.waiters, entry)
+        self._update_gauges()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(entry)
+            raise self._shed(priority, "queue_timeout") from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller went away: pass the slot on
+                self.release()
+            else:
+                self._remove_waiter(entry)
+            raise
+        finally:
+            metrics.observe("jarvis_admission_wait_seconds", int((time.perf_counter() - start) * 1_000_000),
+                            resource=self.name, lane=LANE_NAMES[priority])
+            self._update_gauges()
+
+    def release(self):
+        """Return a slot, handing it to the highest-priority waiter that may take it."""
+        self.in_use -= 1
+        while True:
+            first = self._first_waiter()
+            if first is None or self.in_use >= self._capacity(first[0]):
+                break
+            heapq.heappop(self.waiters)
+            self.in_use += 1
+            first[2].set_result(None)
+        self._update_gauges()
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_NORMAL):
+        """Hold a slot for the duration of the block (see ``acquire``)."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def run_in_executor(self, priority: int, func: Callable, *args) -> Any:
+        """Run a blocking call on the default executor while holding a slot.
+
+        The slot is released when the call returns, not when the caller
+        stops waiting: a call already on a thread cannot be stopped, so
+        cancelling the caller leaves the slot held until the thread is
+        free and the pool keeps bounding the work really running.
+
+        Raises:
+            AdmissionError: If no slot could be had (see ``acquire``)
+        """
+        await self.acquire(priority)
+        try:
+            future = asyncio.get_running_loop().run_in_executor(None, func, *args)
+        except BaseException:
+            self.release()
+            raise
+        future.add_done_callback(lambda _: self.release())
+        return await asyncio.shield(future)
+
+
+class AdmissionController:
+    """Decides what work the backend accepts: per-client rate limits,
+    concurrency caps per resource class, the upload size cap and the
+    number of concurrent audio streams. Everything shed is counted in
+    ``jarvis_admission_rejected_total``.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize admission control with configuration settings.
+
+        Args:
+            config: Dictionary containing configuration parameters
+                - http_rate / http_burst: API requests per second per client IP (default: 10 / 20)
+                - connect_rate / connect_burst: Socket.IO connections per second per IP (default: 1 / 10)
+                - event_rate / event_burst: Socket.IO events per second per sid,
+                  audio frames excluded (default: 5 / 10)
+                - frame_rate / frame_burst: audio_frame events per second per sid (default: 100 / 200)
+                - pools: Concurrency limit per resource class
+                  (default: {"stt": CPU count, "llm": 8})
+                - reserved: Slots per class kept for interactive work (default: 1)
+                - max_queue: Waiters per class before shedding (default: 32)
+                - queue_timeout: Seconds a request may wait for a slot (default: 10)
+                - max_upload_bytes: Largest accepted request body (default: 10 MB)
+                - short_upload_bytes: Uploads up to this size take the
+                  interactive lane (default: 5 s of 16 kHz PCM16)
+                - max_streams: Concurrent audio streams per worker (default: 32)
+        """
+        self.config = config
+        self.limiters = {
+            "http": RateLimiter(config.get("http_rate", 10), config.get("http_burst", 20)),
+            "connect": RateLimiter(config.get("connect_rate", 1), config.get("connect_burst", 10)),
+            "event": RateLimiter(config.get("event_rate", 5), config.get("event_burst", 10)),
+            "frame": RateLimiter(config.get("frame_rate", 100), config.get("frame_burst", 200)),
+        }
+        limits = {"stt": os.cpu_count() or 1, "llm": 8, **config.get("pools", {})}
+        self.pools = {
+            name: ResourcePool(name, limit, reserved=config.get("reserved", 1),
+                               max_queue=config.get("max_queue", 32),
+                               queue_timeout=config.get("queue_timeout", 10.0))
+            for name, limit in limits.items()
+        }
+        self.max_upload_bytes = config.get("max_upload_bytes", 10 * 1024 * 1024)
+        self.short_upload_bytes = config.get("short_upload_bytes", 5 * 16000 * 2 + 1024)
+        self.max_streams = config.get("max_streams", 32)
+
+    def check_rate(self, kind: str, key: str) -> float:
+        """Apply the ``kind`` rate limit ("http", "connect", "event", "frame") to a client.
+
+        Returns:
+            float: 0 if allowed, else seconds until the client may retry
+        """
+        retry_after = self.limiters[kind].check(key)
+        if retry_after:
+            metrics.inc("jarvis_admission_rejected_total", resource=kind, lane="none", reason="rate_limited")
+        return retry_after
+
+    def forget(self, sid: str):
+        """Drop a disconnected session's buckets."""
+        self.limiters["event"].forget(sid)
+        self.limiters["frame"].forget(sid)
+
+    def admit_stream(self, active: int) -> bool:
+        """Whether another audio stream may start with ``active`` already running."""
+        if active < self.max_streams:
+            return True
+        metrics.inc("jarvis_admission_rejected_total", resource="streams", lane="none", reason="capacity")
+        return False
+
+    def upload_lane(self, content_length: Optional[int]) -> int:
+        """Priority lane of an upload: short clips are interactive, long ones batch."""
+        if content_length is None:
+            return PRIORITY_NORMAL
+        return PRIORITY_INTERACTIVE if content_length <= self.short_upload_bytes else PRIORITY_BATCH
+
+    def slot(self, resource: str, priority: int = PRIORITY_NORMAL):
+        """Hold a slot of a resource class (``async with admission.slot("stt", lane):``)."""
+        return self.pools[resource].slot(priority)
+
+
+class _UploadTooLarge(Exception):
+    pass
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying per-IP rate limits and the upload size cap
+    to API requests.
+
+    The body is counted as it streams in, so an oversized upload is refused
+    with 413 before it has been buffered or spooled, whether or not it
+    declared (truthfully) a Content-Length.
+    """
+
+    def __init__(self, app, controller: AdmissionController, prefix: str = "/api/"):
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            controller: Admission controller holding the limits
+            prefix: Only paths under this prefix are limited (health checks
+                and metrics never are)
+        """
+        self.app = app
+        self.controller = controller
+        self.prefix = prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        retry_after = self.controller.check_rate("http", client[0] if client else "unknown")
+        if retry_after:
+            await self._reject(send, 429, "RATE_LIMITED", "Too many requests", retry_after)
+            return
+
+        max_bytes = self.controller.max_upload_bytes
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+            await self._reject_upload(send, max_bytes)
+            return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    rejected = True
+                    await self._reject_upload(send, max_bytes)
+                    # Abort the app's read; swallowed below
+                    raise _UploadTooLarge()
+            return message
+
+        async def guarded_send(message):
+            # The 413 has been sent; drop whatever the app answers
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+    async def _reject_upload(self, send, max_bytes: int):
+        metrics.inc("jarvis_admission_rejected_total", resource="upload", lane="none", reason="too_large")
+        await self._reject(send, 413, "UPLOAD_TOO_LARGE", f"Request body exceeds {max_bytes} bytes")
+
+    @staticmethod
+    async def _reject(send, status: int, error_code: str, message: str, retry_after: float = None):
+        body = json.dumps({"error": message, "error_code": error_code, "status": "error",
+                           "details": {"retry_after": retry_after} if retry_after else {}}).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        if retry_after:
+            headers.append((b"retry-after", str(math.ceil(retry_after)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import signal
+import time
+
+
+class GracefulDrain:
+    """Tracks in-flight work so a worker can finish it before shutting down.
+
+    While draining, the worker stops admitting new Socket.IO connections and
+    reports not-ready on the health check so the load balancer moves traffic
+    to the remaining workers.
+
+    uvicorn closes its listening sockets and every connection before the
+    lifespan shutdown runs, so the drain is started from the SIGTERM handler
+    instead (``install_signal_handler``) and uvicorn's own handler only runs
+    once it is over.
+    """
+
+    def __init__(self, timeout: float = 30.0):
+        """Initialize the drain tracker.
+
+        Args:
+            timeout: Maximum seconds to wait for in-flight work on shutdown
+        """
+        self.timeout = timeout
+        self.draining = False
+        self.in_flight = 0
+        # Created on first drain so it binds to the worker's event loop
+        self._idle = None
+        self._task = None
+
+    def begin(self):
+        """Mark the start of a unit of in-flight work."""
+        self.in_flight += 1
+
+    def end(self):
+        """Mark the end of a unit of in-flight work."""
+        self.in_flight = max(0, self.in_flight - 1)
+        if self.in_flight == 0 and self._idle is not None:
+            self._idle.set()
+
+    async def drain(self) -> bool:
+        """Stop admitting new work and wait for in-flight work to finish.
+
+        Returns:
+            bool: True if everything finished within the timeout
+        """
+        self.draining = True
+        start = time.monotonic()
+        logging.info(f"Draining worker with {self.in_flight} request(s) in flight")
+        self._idle = asyncio.Event()
+        if self.in_flight == 0:
+            self._idle.set()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=self.timeout)
+            logging.info(f"Worker drained in {time.monotonic() - start:.2f}s")
+            return True
+        except asyncio.TimeoutError:
+            logging.warning(f"Drain timed out with {self.in_flight} request(s) still in flight")
+            return False
+
+    def install_signal_handler(self, sig: int = signal.SIGTERM) -> bool:
+        """Drain on ``sig`` before handing it to the server's own handler.
+
+        Call from the lifespan startup, after the server installed its
+        handlers. A second signal during the drain is handed over at once.
+
+        Returns:
+            bool: False if handlers cannot be set here (not the main thread, Windows)
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            previous = signal.getsignal(sig)
+            loop.add_signal_handler(sig, self._on_signal, loop, sig, previous)
+        except (NotImplementedError, RuntimeError, ValueError) as e:
+            logging.warning(f"Cannot drain on signal {sig}, shutting down without draining: {e}")
+            return False
+        return True
+
+    def _on_signal(self, loop: asyncio.AbstractEventLoop, sig: int, previous):
+        if self._task is not None:
+            self._hand_over(loop, sig, previous)
+            return
+
+        async def drain_then_exit():
+            await self.drain()
+            self._hand_over(loop, sig, previous)
+
+        self._task = loop.create_task(drain_then_exit())
+
+    @staticmethod
+    def _hand_over(loop: asyncio.AbstractEventLoop, sig: int, previous):
+        loop.remove_signal_handler(sig)
+        if callable(previous):
+            signal.signal(sig, previous)
+            previous(sig, None)
+        else:
+            signal.raise_signal(sig)
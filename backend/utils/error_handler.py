@@ -1,7 +1,10 @@
+import os
 import logging
 from typing import Dict, Any, Optional
 from fastapi import HTTPException
 from pydantic import ValidationError
+from backend.utils.logging_pipeline import LoggingPipeline
+from backend.utils.metrics import metrics
 
 class JarvisError(Exception):
     """Base exception class for JARVIS AI Assistant"""
@@ -23,6 +26,17 @@ class SystemControlError(JarvisError):
     """Raised when system control operations fail"""
     pass
 
+class WeatherServiceError(JarvisError):
+    """Raised when weather data cannot be fetched"""
+    pass
+
+class AdmissionError(JarvisError):
+    """Raised when admission control sheds a request (rate limit, capacity)"""
+    def __init__(self, message: str, error_code: str = "OVERLOADED", retry_after: float = 1.0,
+                 details: Dict[str, Any] = None):
+        self.retry_after = retry_after
+        super().__init__(message, error_code, {"retry_after": retry_after, **(details or {})})
+
 class ErrorHandler:
     """Centralized error handling for JARVIS AI Assistant"""
     
@@ -31,18 +45,27 @@ class ErrorHandler:
         self.setup_logging()
     
     def setup_logging(self):
-        """Configure logging settings"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('jarvis.log'),
-                logging.StreamHandler()
-            ]
+        """Configure logging settings.
+
+        Records are queued on the calling thread and written by a background
+        listener, so logging never blocks the event loop on file IO.
+        """
+        self.logging_pipeline = LoggingPipeline(
+            level=os.getenv("LOG_LEVEL", "INFO"),
+            log_file=os.getenv("LOG_FILE", "jarvis.log"),
+            max_bytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+            json_console=os.getenv("LOG_JSON_CONSOLE", "false").lower() == "true"
         )
+        self.logging_pipeline.start()
     
     def handle_error(self, error: Exception) -> Dict[str, Any]:
         """Process and format error responses"""
+        error_data = self._format_error(error)
+        metrics.inc("jarvis_errors_total", error_code=error_data["error_code"] or "UNKNOWN")
+        return error_data
+
+    def _format_error(self, error: Exception) -> Dict[str, Any]:
         if isinstance(error, JarvisError):
             self.logger.error(
                 f"JARVIS Error: {error.message}",
@@ -0,0 +1,76 @@
+import importlib
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import Optional
+
+from backend.utils.startup_profiler import startup_profiler
+
+
+class LazyModule(ModuleType):
+    """Module proxy that imports the real module on first attribute access.
+
+    Lets heavy libraries (vosk, transformers, ...) be referenced at module
+    level without paying their import cost until they are actually used.
+    The import time is recorded in the startup profiler.
+    """
+
+    def __init__(self, name: str, install_hint: Optional[str] = None):
+        """Initialize the proxy.
+
+        Args:
+            name: Dotted name of the module to import
+            install_hint: pip package(s) to suggest if the import fails
+        """
+        super().__init__(name)
+        self.__dict__["_install_hint"] = install_hint
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is not None:
+            return module
+        with self.__dict__["_lock"]:
+            module = self.__dict__["_module"]
+            if module is None:
+                start = time.perf_counter()
+                try:
+                    module = importlib.import_module(self.__name__)
+                except ImportError:
+                    logging.error(f"Required library {self.__name__} not installed.")
+                    if self.__dict__["_install_hint"]:
+                        logging.error(f"Please run: pip install {self.__dict__['_install_hint']}")
+                    raise
+                startup_profiler.record_import(self.__name__, time.perf_counter() - start)
+                self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value):
+        # Module configuration (pyautogui.FAILSAFE = True) must reach the
+        # real module, not stay on the proxy
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str):
+        delattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+
+def lazy_module(name: str, install_hint: Optional[str] = None) -> LazyModule:
+    """Return a proxy for ``name`` that is imported on first use.
+
+    Example:
+        vosk = lazy_module("vosk", "vosk")
+        model = vosk.Model(path)  # vosk is imported here
+    """
+    return LazyModule(name, install_hint)
@@ -0,0 +1,232 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Noisy loggers and the volume of INFO/DEBUG records each may emit.
+# rate/burst form a token bucket (records per second); sample keeps 1 in N.
+DEFAULT_LIMITS = {
+    "engineio": {"rate": 20.0, "burst": 50, "sample": 10},
+    "socketio": {"rate": 50.0, "burst": 100, "sample": 1},
+}
+
+# Set in each gunicorn worker to its slot (0..workers-1, reused when a
+# worker is replaced; see gunicorn_conf.py) and used to name its log file
+WORKER_ID_ENV = "JARVIS_WORKER_ID"
+
+# Loggers whose level may be changed at runtime (and their children);
+# getLogger creates any other name permanently
+ADJUSTABLE_LOGGERS = ("backend", "engineio", "socketio", "uvicorn", "fastapi")
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats log records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+        }
+        # Structured fields passed via `extra`, e.g. error_code and details
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Per-logger sampling and token-bucket rate limiting.
+
+    Runs on the calling thread before a record is queued, so a dropped record
+    costs a dict lookup and a few arithmetic operations. WARNING and above are
+    never dropped. The number of dropped records is attached to the next
+    record that passes as ``suppressed``.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None):
+        """Initialize the filter.
+
+        Args:
+            limits: Mapping of logger name prefix to ``rate``, ``burst`` and
+                ``sample`` settings (default: DEFAULT_LIMITS)
+        """
+        super().__init__()
+        self.limits = DEFAULT_LIMITS if limits is None else limits
+        self.buckets: Dict[str, Dict[str, float]] = {}
+        self.suppressed: Dict[str, int] = {}
+        self._prefix_cache: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def _prefix_for(self, name: str) -> Optional[str]:
+        try:
+            return self._prefix_cache[name]
+        except KeyError:
+            match = None
+            for prefix in self.limits:
+                if name == prefix or name.startswith(prefix + "."):
+                    if match is None or len(prefix) > len(match):
+                        match = prefix
+            self._prefix_cache[name] = match
+            return match
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        prefix = self._prefix_for(record.name)
+        if prefix is None:
+            return True
+
+        limit = self.limits[prefix]
+        with self._lock:
+            bucket = self.buckets.get(prefix)
+            now = time.monotonic()
+            if bucket is None:
+                bucket = self.buckets[prefix] = {"tokens": limit["burst"], "stamp": now, "seen": 0}
+            bucket["seen"] += 1
+            bucket["tokens"] = min(limit["burst"], bucket["tokens"] + (now - bucket["stamp"]) * limit["rate"])
+            bucket["stamp"] = now
+
+            if bucket["seen"] % int(limit.get("sample", 1)) != 0 or bucket["tokens"] < 1:
+                self.suppressed[prefix] = self.suppressed.get(prefix, 0) + 1
+                return False
+
+            bucket["tokens"] -= 1
+            dropped = self.suppressed.pop(prefix, 0)
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class LoggingPipeline:
+    """Non-blocking logging: callers only enqueue records, a background
+    listener thread formats them and does the file and console IO."""
+
+    def __init__(self, level: Union[int, str] = logging.INFO, log_file: str = "jarvis.log",
+                 max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 json_console: bool = False, limits: Optional[Dict[str, Dict[str, float]]] = None):
+        """Initialize the pipeline.
+
+        Args:
+            level: Root log level
+            log_file: Path of the JSON log file
+            max_bytes: Size at which the log file is rotated
+            backup_count: Number of rotated files to keep
+            json_console: Write JSON to the console instead of plain text
+            limits: Per-logger sampling and rate limits (see RateLimitFilter)
+        """
+        self.level = level
+        self.log_file = log_file
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        file_handler = self._file_handler(log_file)
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(
+            JsonFormatter() if json_console
+            else logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        )
+
+        self.handlers = [file_handler, console_handler]
+        self.queue_handler = logging.handlers.QueueHandler(self.queue)
+        self.rate_limit_filter = RateLimitFilter(limits)
+        self.queue_handler.addFilter(self.rate_limit_filter)
+        self.listener = logging.handlers.QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self._started = False
+
+    def _file_handler(self, path: str) -> logging.Handler:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding="utf-8"
+        )
+        handler.setFormatter(JsonFormatter())
+        return handler
+
+    def worker_log_file(self) -> str:
+        """Log file of a forked worker: ``jarvis.worker<N>.log`` for gunicorn
+        worker slot N, so a restarted worker continues its predecessor's
+        rotation set and the total stays bounded. Other forks fall back to
+        one file per pid."""
+        root, ext = os.path.splitext(self.log_file)
+        worker_id = os.environ.get(WORKER_ID_ENV)
+        return f"{root}.worker{worker_id}{ext}" if worker_id is not None else f"{root}.{os.getpid()}{ext}"
+
+    def _after_fork(self):
+        # The listener thread does not survive fork. Give each worker its own
+        # queue, listener and log file, since rotating one file from several
+        # processes loses records.
+        if not self._started:
+            return
+        self.queue = queue.SimpleQueue()
+        self.queue_handler.queue = self.queue
+        self.rate_limit_filter._lock = threading.Lock()
+        self.handlers[0].close()
+        self.handlers[0] = self._file_handler(self.worker_log_file())
+        self.listener = logging.handlers.QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def start(self):
+        """Route the root logger through the queue and start the listener."""
+        if self._started:
+            return
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        self.set_level(self.level)
+        self.listener.start()
+        self._started = True
+        atexit.register(self.stop)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def stop(self):
+        """Flush queued records and stop the listener thread."""
+        if not self._started:
+            return
+        self._started = False
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+
+    def set_level(self, level: Union[int, str], logger_name: Optional[str] = None) -> int:
+        """Change a log level at runtime.
+
+        Args:
+            level: Level name (e.g. "DEBUG") or number
+            logger_name: Logger to change (default: the root logger); must
+                be one of ADJUSTABLE_LOGGERS or a child of one
+
+        Returns:
+            int: The numeric level that was applied
+
+        Raises:
+            ValueError: If the level or logger name is not recognized
+        """
+        if logger_name is not None and not any(
+                logger_name == prefix or logger_name.startswith(prefix + ".") for prefix in ADJUSTABLE_LOGGERS):
+            raise ValueError(f"Unknown logger: {logger_name}")
+        if isinstance(level, str):
+            numeric = logging.getLevelName(level.upper())
+            if not isinstance(numeric, int):
+                raise ValueError(f"Unknown log level: {level}")
+            level = numeric
+        logging.getLogger(logger_name).setLevel(level)
+        if logger_name is None:
+            self.level = level
+        return level
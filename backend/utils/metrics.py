@@ -0,0 +1,290 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Histograms keep 2**SUB_BUCKET_BITS buckets per power of two (HDR-style
+# log-linear layout), bounding the relative error of any quantile to ~12.5%
+# while recording stays a couple of integer operations.
+SUB_BUCKET_BITS = 3
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+LINEAR_LIMIT = SUB_BUCKET_COUNT << 1
+
+# Bucket boundaries (seconds) reported in the Prometheus exposition
+EXPORT_BOUNDARIES = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+EXPORT_QUANTILES = (0.5, 0.9, 0.99)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _bucket_index(value: int) -> int:
+    if value < LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return ((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - SUB_BUCKET_COUNT
+
+
+def _bucket_upper(index: int) -> int:
+    if index < LINEAR_LIMIT:
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = (index & (SUB_BUCKET_COUNT - 1)) + SUB_BUCKET_COUNT
+    return ((mantissa + 1) << shift) - 1
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + body + "}"
+
+
+class Histogram:
+    """Log-linear latency histogram with microsecond resolution."""
+
+    def __init__(self):
+        self.counts: List[int] = []
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, value_us: int):
+        """Record one observation in microseconds."""
+        index = _bucket_index(value_us)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def quantile(self, q: float) -> int:
+        """Approximate value (microseconds) at quantile ``q`` (0-1)."""
+        if not self.count:
+            return 0
+        target = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(_bucket_upper(index), self.max_us)
+        return self.max_us
+
+    def cumulative(self, boundaries_us: Iterable[int]) -> List[int]:
+        """Number of observations at or below each boundary."""
+        result = []
+        seen = 0
+        index = 0
+        for boundary in boundaries_us:
+            while index < len(self.counts) and _bucket_upper(index) <= boundary:
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and latency histograms rendered in the
+    Prometheus text format. Each worker process keeps its own registry."""
+
+    def __init__(self):
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.help: Dict[str, str] = {}
+        self._stages: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, text: str):
+        """Set the HELP text of a metric."""
+        self.help[name] = text
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a counter."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        """Set a gauge."""
+        key = tuple(sorted(labels.items()))
+        self.gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value_us: int, **labels):
+        """Record a latency observation in microseconds."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.record(value_us)
+
+    def stage_histogram(self, stage: str) -> Histogram:
+        """Return (creating if needed) the latency histogram of a stage."""
+        histogram = self._stages.get(stage)
+        if histogram is not None:
+            return histogram
+        key = (("stage", stage),)
+        with self._lock:
+            series = self.histograms.setdefault("jarvis_stage_latency_seconds", {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            self._stages[stage] = histogram
+            return histogram
+
+    def get_histogram(self, name: str, **labels) -> Optional[Histogram]:
+        """Return the histogram for a metric and label set, if recorded."""
+        return self.histograms.get(name, {}).get(tuple(sorted(labels.items())))
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        boundaries_us = [int(b * 1_000_000) for b in EXPORT_BOUNDARIES]
+        with self._lock:
+            for kind, store in (("counter", self.counters), ("gauge", self.gauges)):
+                for name, series in sorted(store.items()):
+                    if name in self.help:
+                        lines.append(f"# HELP {name} {self.help[name]}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for key, value in series.items():
+                        lines.append(f"{name}{_format_labels(key)} {value}")
+
+            for name, series in sorted(self.histograms.items()):
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in series.items():
+                    for boundary, seen in zip(EXPORT_BOUNDARIES, histogram.cumulative(boundaries_us)):
+                        lines.append(f"{name}_bucket{_format_labels(key, [('le', str(boundary))])} {seen}")
+                    lines.append(f"{name}_bucket{_format_labels(key, [('le', '+Inf')])} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.total_us / 1_000_000}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+                # Quantiles from the full-resolution histogram, as a separate gauge family
+                quantile_name = f"{name}_quantile"
+                lines.append(f"# TYPE {quantile_name} gauge")
+                for key, histogram in series.items():
+                    for q in EXPORT_QUANTILES:
+                        value = histogram.quantile(q) / 1_000_000
+                        lines.append(f"{quantile_name}{_format_labels(key, [('quantile', str(q))])} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
+metrics.describe("jarvis_stage_latency_seconds", "Latency of each processing stage")
+metrics.describe("jarvis_stage_errors_total", "Exceptions raised by each processing stage")
+metrics.describe("jarvis_errors_total", "Errors handled by ErrorHandler, by error code")
+metrics.describe("jarvis_event_loop_lag_seconds", "How late the event loop ran a scheduled callback")
+
+
+class span:
+    """Time a block of code as one observation of ``stage``.
+
+    A plain class rather than a generator-based context manager, and the
+    stage histogram is resolved once, to keep the per-call cost on the hot
+    path to two clock reads and a bucket increment.
+
+    Example:
+        with span("stt.decode"):
+            ...
+    """
+
+    __slots__ = ("stage", "histogram", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.histogram = metrics.stage_histogram(stage)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_us = (time.perf_counter_ns() - self.start) // 1000
+        self.histogram.record(elapsed_us)
+        if exc_type is not None and issubclass(exc_type, Exception):
+            metrics.inc("jarvis_stage_errors_total", stage=self.stage)
+        return False
+
+
+def timed(stage: str) -> Callable:
+    """Decorator recording the latency of a sync or async function as ``stage``."""
+    def decorator(func: Callable) -> Callable:
+        histogram = metrics.stage_histogram(stage)
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    metrics.inc("jarvis_stage_errors_total", stage=stage)
+                    raise
+                finally:
+                    histogram.record((time.perf_counter_ns() - start) // 1000)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                metrics.inc("jarvis_stage_errors_total", stage=stage)
+                raise
+            finally:
+                histogram.record((time.perf_counter_ns() - start) // 1000)
+        return wrapper
+    return decorator
+
+
+class LoopLagMonitor:
+    """Measures event loop lag: how late a periodic sleep wakes up."""
+
+    def __init__(self, interval: float = 0.5):
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between probes
+        """
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_us = max(0, int((time.perf_counter() - expected) * 1_000_000))
+            metrics.observe("jarvis_event_loop_lag_seconds", lag_us)
+            metrics.set("jarvis_event_loop_lag_last_seconds", lag_us / 1_000_000)
+            if lag_us > 100_000:
+                logging.warning(f"Event loop lagged by {lag_us / 1000:.1f} ms")
+
+    def start(self):
+        """Start probing on the running event loop."""
+        if self.task is None:
+            self.task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Stop probing."""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import struct
+import threading
+from typing import Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import socketio
+# Not exported at the top level of the socketio package
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+# Every frame on the bus is a 4-byte big-endian length followed by the payload
+FRAME_HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+def parse_local_url(url: str) -> Tuple[str, int]:
+    """Split a ``local://host:port`` message queue URL into host and port.
+
+    Args:
+        url: Message queue URL
+
+    Returns:
+        Tuple[str, int]: Host and port of the hub
+    """
+    parsed = urlparse(url)
+    if parsed.scheme != "local":
+        raise ValueError(f"Unsupported message queue URL: {url}")
+    return parsed.hostname or "127.0.0.1", parsed.port or 8765
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    header = await reader.readexactly(FRAME_HEADER.size)
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {length} bytes exceeds the bus limit")
+    return await reader.readexactly(length)
+
+
+def _write_frame(writer: asyncio.StreamWriter, payload: bytes):
+    writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+class LocalPubSubHub:
+    """Fan-out hub that relays Socket.IO manager messages between workers
+    on the same host, so a multi-worker deployment works without Redis."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765):
+        """Initialize the hub.
+
+        Args:
+            host: Interface to listen on (keep this on loopback)
+            port: TCP port to listen on
+        """
+        self.host = host
+        self.port = port
+        self.clients: Set[asyncio.StreamWriter] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.clients.add(writer)
+        try:
+            while True:
+                payload = await _read_frame(reader)
+                # Like Redis pub/sub, every subscriber (sender included) gets the
+                # message; the manager drops its own messages by host id
+                for client in list(self.clients):
+                    try:
+                        _write_frame(client, payload)
+                    except Exception:
+                        self.clients.discard(client)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            logging.error(f"Message bus client error: {e}")
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    async def start(self):
+        """Start listening on the current event loop."""
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        # Port 0 picks a free port, report the real one back
+        self.port = self.server.sockets[0].getsockname()[1]
+        logging.info(f"Message bus hub listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        """Stop the hub and drop all connected workers."""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        for client in list(self.clients):
+            client.close()
+        self.clients.clear()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.start())
+        self._ready.set()
+        self.loop.run_forever()
+
+    def start_in_thread(self) -> int:
+        """Run the hub on a daemon thread (used by the master process).
+
+        Returns:
+            int: Port the hub is listening on
+        """
+        self.thread = threading.Thread(target=self._run, name="jarvis-pubsub-hub", daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        return self.port
+
+    def stop_thread(self):
+        """Stop a hub started with ``start_in_thread``."""
+        if self.loop and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.stop(), self.loop).result(timeout=5)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread:
+            self.thread.join(timeout=5)
+
+
+class AsyncLocalManager(AsyncPubSubManager):
+    """Socket.IO client manager backed by a ``LocalPubSubHub``.
+
+    Drop-in replacement for ``socketio.AsyncRedisManager`` for single-host
+    deployments: ``AsyncLocalManager("local://127.0.0.1:8765")``.
+    """
+
+    name = "local"
+
+    def __init__(self, url: str = "local://127.0.0.1:8765", channel: str = "socketio",
+                 write_only: bool = False, logger=None):
+        self.host, self.port = parse_local_url(url)
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+    async def _connect(self):
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.writer is None or self.writer.is_closing():
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def _reset(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def _publish(self, data):
+        # JSON, which is all AsyncPubSubManager decodes (python-socketio >= 5.14);
+        # never unpickle what arrives on a TCP port
+        payload = self.json.dumps(data).encode()
+        for retry in range(2):
+            try:
+                await self._connect()
+                _write_frame(self.writer, payload)
+                await self.writer.drain()
+                return
+            except (ConnectionError, OSError) as e:
+                logging.error(f"Message bus publish failed (attempt {retry + 1}): {e}")
+                self._reset()
+
+    async def _listen(self):
+        retry_sleep = 1
+        while True:
+            try:
+                await self._connect()
+                retry_sleep = 1
+                while True:
+                    yield await _read_frame(self.reader)
+            except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+                logging.error(f"Message bus connection lost, retrying in {retry_sleep}s: {e}")
+                self._reset()
+                await asyncio.sleep(retry_sleep)
+                retry_sleep = min(retry_sleep * 2, 60)
+
+
+def create_client_manager(url: Optional[str]):
+    """Build the Socket.IO client manager for the configured message queue.
+
+    Args:
+        url: ``redis://...``, ``local://host:port`` or None for in-memory
+
+    Returns:
+        A Socket.IO client manager, or None for the default in-memory manager
+    """
+    if not url:
+        return None
+    if url.startswith("local://"):
+        return AsyncLocalManager(url)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return socketio.AsyncRedisManager(url)
+    raise ValueError(f"Unsupported message queue URL: {url}")
@@ -0,0 +1,60 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# Reference point for "time since startup"; this module is imported first
+# thing by backend.main
+_PROCESS_T0 = time.perf_counter()
+
+
+class StartupProfiler:
+    """Records how long each heavy import and each component build took."""
+
+    def __init__(self):
+        self.imports: Dict[str, float] = {}
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self.checkpoints: Dict[str, float] = {}
+
+    def record_import(self, module: str, seconds: float):
+        """Record the duration of a (lazy) module import."""
+        self.imports[module] = seconds
+
+    def checkpoint(self, name: str):
+        """Record the time since startup at a named point, e.g. "app_imported"."""
+        self.checkpoints[name] = time.perf_counter() - _PROCESS_T0
+
+    @contextmanager
+    def component(self, name: str):
+        """Time the construction of a component.
+
+        Example:
+            with startup_profiler.component("voice_processor"):
+                voice_processor = VoiceProcessor(config)
+        """
+        start = time.perf_counter()
+        entry: Dict[str, Any] = {"status": "building"}
+        self.components[name] = entry
+        try:
+            yield
+            entry["status"] = "ready"
+        except Exception as e:
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+            raise
+        finally:
+            entry["seconds"] = round(time.perf_counter() - start, 4)
+            logging.info(f"Startup: {name} {entry['status']} in {entry['seconds']:.3f}s")
+
+    def report(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Summary of imports, component builds and checkpoints (seconds)."""
+        return {
+            "imports": {name: round(seconds, 4) for name, seconds in
+                        sorted(self.imports.items(), key=lambda item: -item[1])},
+            "components": self.components,
+            "checkpoints": {name: round(seconds, 4) for name, seconds in self.checkpoints.items()},
+        }
+
+
+# Global startup profiler instance
+startup_profiler = StartupProfiler()
@@ -0,0 +1,2 @@
+# JARVIS AI Assistant Benchmarks
+# Performance benchmarks for the JARVIS AI Assistant backend
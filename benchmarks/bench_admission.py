@@ -0,0 +1,107 @@
+"""Short-command latency while batch jobs saturate a resource class.
+
+Runs a stream of long "batch" jobs (long uploads) and occasional short
+"interactive" jobs (commands) through one ``ResourcePool``, first with
+every job in the same lane (a plain FIFO semaphore) and then with priority
+lanes and reserved slots. Jobs run like transcriptions do on the server,
+through ``ResourcePool.run_in_executor``: CPU work on executor threads
+(SHA-256 over a buffer, which releases the GIL as Vosk does) calibrated to
+the service time, so the numbers include CPU contention as well as
+queueing, but not the recognizer itself.
+
+    python -m benchmarks.bench_admission --limit 4 --batch-clients 16
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from backend.utils.admission import PRIORITY_BATCH, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, ResourcePool
+from backend.utils.error_handler import AdmissionError
+
+
+BLOCK = b"\x00" * (1 << 20)
+
+
+def _calibrate() -> float:
+    """Seconds one SHA-256 pass over BLOCK takes on this machine."""
+    start = time.perf_counter()
+    for _ in range(20):
+        hashlib.sha256(BLOCK).digest()
+    return (time.perf_counter() - start) / 20
+
+
+def _cpu_job(passes: int):
+    for _ in range(passes):
+        hashlib.sha256(BLOCK).digest()
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 1)
+
+
+async def _run(lanes: bool, args) -> Dict[str, Any]:
+    pool = ResourcePool("stt", args.limit, reserved=args.reserved if lanes else 0,
+                        max_queue=args.max_queue, queue_timeout=args.queue_timeout)
+    latencies: Dict[str, List[float]] = {"interactive": [], "batch": []}
+    shed = {"interactive": 0, "batch": 0}
+    deadline = time.perf_counter() + args.duration
+
+    async def client(kind: str, priority: int, service: float, think: float, seed: int):
+        rng = random.Random(seed)
+        passes = max(1, round(service / args.pass_seconds))
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await pool.run_in_executor(priority if lanes else PRIORITY_NORMAL, _cpu_job, passes)
+                latencies[kind].append((time.perf_counter() - start) * 1000)
+            except AdmissionError:
+                shed[kind] += 1
+            await asyncio.sleep(rng.expovariate(1 / think))
+
+    clients = [client("batch", PRIORITY_BATCH, args.batch_seconds, 0.05, i) for i in range(args.batch_clients)]
+    clients += [client("interactive", PRIORITY_INTERACTIVE, args.command_seconds, 1.0, 1000 + i)
+                for i in range(args.command_clients)]
+    await asyncio.gather(*clients)
+    return {
+        "lanes": lanes,
+        **{f"{kind}_p50_ms": _percentile(values, 0.5) for kind, values in latencies.items()},
+        **{f"{kind}_p99_ms": _percentile(values, 0.99) for kind, values in latencies.items()},
+        **{f"{kind}_done": len(values) for kind, values in latencies.items()},
+        **{f"{kind}_shed": count for kind, count in shed.items()},
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=4, help="Concurrent slots")
+    parser.add_argument("--reserved", type=int, default=1, help="Slots reserved for interactive jobs")
+    parser.add_argument("--batch-clients", type=int, default=16)
+    parser.add_argument("--command-clients", type=int, default=4)
+    parser.add_argument("--batch-seconds", type=float, default=1.0, help="Service time of a batch job")
+    parser.add_argument("--command-seconds", type=float, default=0.1, help="Service time of a command")
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--queue-timeout", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+    args.pass_seconds = _calibrate()
+
+    results = [asyncio.run(_run(lanes, args)) for lanes in (False, True)]
+    for result in results:
+        print(f"lanes={str(result['lanes']):<5}: commands p50 {result['interactive_p50_ms']:>7.1f} ms "
+              f"p99 {result['interactive_p99_ms']:>7.1f} ms | batch p50 {result['batch_p50_ms']:>7.1f} ms, "
+              f"{result['batch_done']} done, {result['batch_shed']} shed")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
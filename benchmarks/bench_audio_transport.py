@@ -0,0 +1,178 @@
+"""Bytes on the wire for one utterance: multipart upload vs streamed frames.
+
+Compares, for the same clip:
+- ``multipart``: one POST /api/process_voice with a WAV file, as the
+  frontend uploads today
+- ``sio_ws_pcm16``: raw int16 frames as Socket.IO binary attachments over
+  websocket (backend/services/audio_stream.py)
+- ``sio_ws_opus``: Opus frames over websocket, encoded with opuslib
+  (skipped when opuslib or the libopus library is missing)
+- ``sio_polling_pcm16``: the same frames over long-polling, where binary is
+  base64-encoded into HTTP requests
+
+Counts application bytes plus HTTP/WebSocket framing (not TCP/IP headers),
+and measures server-side CPU per frame for parsing and jitter buffering.
+
+    python -m benchmarks.bench_audio_transport --seconds 3 --frame-ms 20
+"""
+import argparse
+import base64
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.services.audio_stream import CODEC_OPUS, CODEC_PCM16, FRAME_HEADER, JitterBuffer, decode_frame, encode_frame
+from benchmarks.fixtures import SAMPLE_RATE, synthetic_speech, to_wav
+
+# Representative browser request headers (everything but the request line,
+# Content-Type and Content-Length)
+BROWSER_HEADERS = (
+    "Host: localhost:8000\r\n"
+    "Connection: keep-alive\r\n"
+    "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36\r\n"
+    "Accept: application/json, text/plain, */*\r\n"
+    "Origin: http://localhost:5173\r\n"
+    "Referer: http://localhost:5173/\r\n"
+    "Accept-Encoding: gzip, deflate, br\r\n"
+    "Accept-Language: en-US,en;q=0.9\r\n"
+)
+
+# Socket.IO v5 binary event (type 5, one attachment) inside an engine.io
+# message (type 4); the attachment follows as a separate binary message
+SIO_PLACEHOLDER_PACKET = '451-["audio_frame",{"_placeholder":true,"num":0}]'
+
+
+def ws_frame_overhead(payload_len: int, masked: bool = True) -> int:
+    """WebSocket frame header size; client-to-server frames are masked."""
+    if payload_len < 126:
+        header = 2
+    elif payload_len < 65536:
+        header = 4
+    else:
+        header = 10
+    return header + (4 if masked else 0)
+
+
+def multipart_bytes(pcm: bytes) -> Dict[str, Any]:
+    boundary = "----WebKitFormBoundary7MA4YWxkTrZu0gW"
+    wav = to_wav(pcm)
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="audio_file"; filename="recording.wav"\r\n'
+        "Content-Type: audio/wav\r\n\r\n"
+    ).encode() + wav + f"\r\n--{boundary}--\r\n".encode()
+    head = (
+        "POST /api/process_voice HTTP/1.1\r\n" + BROWSER_HEADERS
+        + f"Content-Type: multipart/form-data; boundary={boundary}\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode()
+    total = len(head) + len(body)
+    return {"total_bytes": total, "overhead_bytes": total - len(pcm), "frames": 1}
+
+
+def sio_ws_bytes(payloads: List[bytes], codec: int, frame_ms: int) -> Dict[str, Any]:
+    total = 0
+    for seq, payload in enumerate(payloads):
+        frame = encode_frame(seq, payload, codec, frame_ms)
+        total += len(SIO_PLACEHOLDER_PACKET) + ws_frame_overhead(len(SIO_PLACEHOLDER_PACKET))
+        total += len(frame) + ws_frame_overhead(len(frame))
+    audio = sum(len(p) for p in payloads)
+    return {
+        "total_bytes": total,
+        "overhead_bytes": total - audio,
+        "frames": len(payloads),
+        "overhead_per_frame": round((total - audio) / len(payloads), 1),
+    }
+
+
+def sio_polling_bytes(payloads: List[bytes], frame_ms: int, frames_per_poll: int) -> Dict[str, Any]:
+    total = 0
+    for start in range(0, len(payloads), frames_per_poll):
+        packets = []
+        for seq, payload in enumerate(payloads[start:start + frames_per_poll], start):
+            packets.append(SIO_PLACEHOLDER_PACKET)
+            packets.append("b" + base64.b64encode(encode_frame(seq, payload, CODEC_PCM16, frame_ms)).decode())
+        body = "\x1e".join(packets).encode()
+        head = (
+            "POST /socket.io/?EIO=4&transport=polling&t=OxYzAbC&sid=Zm9vYmFyYmF6cXV4MTIzNDU2 HTTP/1.1\r\n"
+            + BROWSER_HEADERS + f"Content-Type: text/plain;charset=UTF-8\r\nContent-Length: {len(body)}\r\n\r\n"
+        ).encode()
+        total += len(head) + len(body)
+    audio = sum(len(p) for p in payloads)
+    return {
+        "total_bytes": total,
+        "overhead_bytes": total - audio,
+        "frames": len(payloads),
+        "overhead_per_frame": round((total - audio) / len(payloads), 1),
+    }
+
+
+def opus_payloads(pcm: bytes, frame_ms: int, bitrate: int) -> Tuple[Optional[List[bytes]], str]:
+    """Encode ``pcm`` into Opus packets.
+
+    Returns:
+        Tuple: (packets, "opuslib"), or (None, reason) if opuslib is unavailable
+    """
+    samples = SAMPLE_RATE * frame_ms // 1000
+    chunks = [pcm[i:i + samples * 2] for i in range(0, len(pcm) - samples * 2 + 1, samples * 2)]
+    try:
+        import opuslib
+    except Exception as e:
+        # opuslib raises a plain Exception when libopus itself is missing
+        return None, f"opuslib unavailable: {e}"
+    encoder = opuslib.Encoder(SAMPLE_RATE, 1, opuslib.APPLICATION_VOIP)
+    encoder.bitrate = bitrate
+    return [encoder.encode(chunk, samples) for chunk in chunks], "opuslib"
+
+
+def server_cpu_per_frame(payloads: List[bytes], frame_ms: int) -> float:
+    """Microseconds to parse and jitter-buffer one frame on the server."""
+    frames = [encode_frame(seq, payload, CODEC_PCM16, frame_ms) for seq, payload in enumerate(payloads)]
+    buffer = JitterBuffer()
+    start = time.perf_counter()
+    for data in frames:
+        buffer.push(decode_frame(data))
+    return (time.perf_counter() - start) * 1_000_000 / len(frames)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--opus-bitrate", type=int, default=24000)
+    parser.add_argument("--frames-per-poll", type=int, default=5, help="Frames batched into one polling request")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    pcm = synthetic_speech(args.seconds)
+    samples = SAMPLE_RATE * args.frame_ms // 1000
+    pcm_payloads = [pcm[i:i + samples * 2] for i in range(0, len(pcm), samples * 2)]
+    opus, opus_source = opus_payloads(pcm, args.frame_ms, args.opus_bitrate)
+
+    results = {
+        "audio_bytes": len(pcm),
+        "frame_header_bytes": FRAME_HEADER.size,
+        "multipart": multipart_bytes(pcm),
+        "sio_ws_pcm16": sio_ws_bytes(pcm_payloads, CODEC_PCM16, args.frame_ms),
+        "sio_ws_opus": ({**sio_ws_bytes(opus, CODEC_OPUS, args.frame_ms), "encoder": opus_source}
+                        if opus is not None else {"skipped": opus_source}),
+        "sio_polling_pcm16": sio_polling_bytes(pcm_payloads, args.frame_ms, args.frames_per_poll),
+        "server_us_per_frame": round(server_cpu_per_frame(pcm_payloads, args.frame_ms), 2),
+    }
+    base = results["multipart"]["total_bytes"]
+    for name in ("multipart", "sio_ws_pcm16", "sio_ws_opus", "sio_polling_pcm16"):
+        result = results[name]
+        if "skipped" in result:
+            print(f"{name:>18}: skipped ({result['skipped']})")
+            continue
+        result["vs_multipart"] = round(result["total_bytes"] / base, 3)
+        print(f"{name:>18}: {result['total_bytes']:>9} bytes ({result['vs_multipart']:.2f}x multipart), "
+              f"{result.get('overhead_per_frame', result['overhead_bytes'])} overhead bytes per frame")
+    print(f"server parse + jitter buffer: {results['server_us_per_frame']} us per frame")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
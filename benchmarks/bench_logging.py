@@ -0,0 +1,111 @@
+"""Event loop stall caused by logging.
+
+Simulates Socket.IO packet logging from the event loop and measures how late
+a 1 ms ticker wakes up, comparing the old synchronous FileHandler setup with
+the queued pipeline in backend/utils/logging_pipeline.py. The pipeline runs
+twice: unsampled (``limits={}``, every record is queued, like the sync
+setup) to isolate the cost of queueing, and with the default engineio
+sampling and rate limits.
+
+    python -m benchmarks.bench_logging --records-per-tick 20 --duration 5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from backend.utils.logging_pipeline import LoggingPipeline
+
+
+def _reset_root():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+def setup_sync(log_dir: str):
+    """The previous configuration: FileHandler + StreamHandler on the loop."""
+    _reset_root()
+    console = logging.StreamHandler(open(os.devnull, "w"))
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.FileHandler(os.path.join(log_dir, "sync.log")), console],
+    )
+    return None
+
+
+def setup_pipeline(log_dir: str, limits: Optional[Dict[str, Dict[str, float]]] = None):
+    _reset_root()
+    pipeline = LoggingPipeline(level=logging.INFO, log_file=os.path.join(log_dir, "pipeline.log"), limits=limits)
+    pipeline.handlers[1].setStream(open(os.devnull, "w"))
+    pipeline.start()
+    return pipeline
+
+
+async def _measure(records_per_tick: int, duration: float) -> Dict[str, Any]:
+    engineio = logging.getLogger("engineio.server")
+    lags: List[float] = []
+    stop = time.perf_counter() + duration
+    emitted = 0
+
+    async def ticker():
+        interval = 0.001
+        while time.perf_counter() < stop:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+    async def packets():
+        nonlocal emitted
+        while time.perf_counter() < stop:
+            for i in range(records_per_tick):
+                engineio.info('%s: Sending packet MESSAGE data 2["message",{"response":"%d"}]', "sid", i)
+            emitted += records_per_tick
+            await asyncio.sleep(0)
+
+    await asyncio.gather(ticker(), packets())
+    lags.sort()
+    return {
+        "records": emitted,
+        "lag_p50_ms": round(statistics.median(lags), 3),
+        "lag_p99_ms": round(lags[int(len(lags) * 0.99) - 1], 3),
+        "lag_max_ms": round(lags[-1], 3),
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records-per-tick", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as log_dir:
+        for name, setup in (("sync_file_handler", setup_sync),
+                            ("queue_unsampled", partial(setup_pipeline, limits={})),
+                            ("queue_sampled", setup_pipeline)):
+            pipeline = setup(log_dir)
+            results[name] = asyncio.run(_measure(args.records_per_tick, args.duration))
+            if pipeline:
+                pipeline.stop()
+            _reset_root()
+
+    for name, result in results.items():
+        print(f"{name:>18}: p50 {result['lag_p50_ms']:.3f} ms, p99 {result['lag_p99_ms']:.3f} ms, "
+              f"max {result['lag_max_ms']:.3f} ms over {result['records']} records")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
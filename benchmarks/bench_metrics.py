@@ -0,0 +1,73 @@
+"""Overhead of the latency instrumentation in backend/utils/metrics.py.
+
+Measures the cost of one ``span``/``timed`` observation and compares it to
+the fastest instrumented stage we care about (default 1 ms; STT and LLM
+stages take tens to thousands of ms).
+
+    python -m benchmarks.bench_metrics --iterations 200000 --stage-ms 1
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from backend.utils.metrics import MetricsRegistry, span, timed
+
+
+def _per_call_ns(func, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--stage-ms", type=float, default=1.0)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    def bare():
+        pass
+
+    def with_span():
+        with span("bench.span"):
+            pass
+
+    @timed("bench.timed")
+    def decorated():
+        pass
+
+    @timed("bench.async")
+    async def decorated_async():
+        pass
+
+    async def async_loop():
+        start = time.perf_counter_ns()
+        for _ in range(args.iterations):
+            await decorated_async()
+        return (time.perf_counter_ns() - start) / args.iterations
+
+    registry = MetricsRegistry()
+    baseline = _per_call_ns(bare, args.iterations)
+    results = {
+        "span_ns": _per_call_ns(with_span, args.iterations) - baseline,
+        "timed_ns": _per_call_ns(decorated, args.iterations) - baseline,
+        "timed_async_ns": asyncio.run(async_loop()) - baseline,
+        "observe_ns": _per_call_ns(lambda: registry.observe("bench", 1234, stage="x"), args.iterations) - baseline,
+    }
+    stage_ns = args.stage_ms * 1_000_000
+    results = {key: round(value, 1) for key, value in results.items()}
+    results["overhead_pct_of_stage"] = round(100 * max(results["span_ns"], results["timed_async_ns"]) / stage_ns, 4)
+
+    for key, value in results.items():
+        print(f"{key:>22}: {value}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Perceived turn latency with and without speculative LLM requests.
+
+Plays scripted utterances through ``SpeculativeExecutor`` the way the
+``audio_frame``/``audio_end`` handlers do: one partial transcript per word
+at speaking pace, then the final transcript after Vosk's end-of-speech
+delay. Turn latency is the time from the final transcript to the answer.
+The LLM is a stand-in with a fixed latency, so the numbers isolate the
+overlap with speech, not Gemini itself.
+
+Scripts cover the cases that matter for accounting: the final matches the
+last stable partial (committed), the user keeps talking after a pause
+(cancelled, then committed), and the recognizer revises the final
+(cancelled, answered from scratch).
+
+    python -m benchmarks.bench_speculation --llm-latency 0.8 --stable-ms 300
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from backend.services.speculation import SpeculativeExecutor
+
+# (words as spoken, pause in seconds before each word, final transcript)
+SCRIPTS: List[Tuple[str, List[float], str]] = [
+    ("what is the weather like today", [0.0, 0.2, 0.15, 0.25, 0.2, 0.25], "what is the weather like today"),
+    ("tell me a joke about robots", [0.0, 0.2, 0.25, 0.2, 0.6, 0.25], "tell me a joke about robots"),
+    ("remind me to call mom", [0.0, 0.25, 0.2, 0.25, 0.2], "remind me to call tom"),
+]
+
+
+class StubAI:
+    """GeminiAI stand-in: fixed generation latency, no network."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def warm(self) -> bool:
+        return True
+
+    async def generate(self, prompt: str, context=None) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return f"answer to {prompt}"
+
+
+async def _play(executor: SpeculativeExecutor, sid: str, script, endpoint_delay: float) -> float:
+    words, pauses, final = script
+    executor.start(sid)
+    spoken: List[str] = []
+    for word, pause in zip(words.split(), pauses):
+        await asyncio.sleep(pause)
+        spoken.append(word)
+        executor.on_partial(sid, " ".join(spoken))
+    await asyncio.sleep(endpoint_delay)
+    start = time.perf_counter()
+    await executor.finish(sid, final)
+    return (time.perf_counter() - start) * 1000
+
+
+async def _run(speculate: bool, args) -> Dict[str, Any]:
+    ai = StubAI(args.llm_latency)
+    components = {"ai": ai}
+    executor = SpeculativeExecutor(components.get, {"enabled": speculate, "stable_ms": args.stable_ms})
+    latencies = []
+    for _ in range(args.repeat):
+        for index, script in enumerate(SCRIPTS):
+            latencies.append(await _play(executor, f"sid{index}", script, args.endpoint_delay))
+    return {
+        "speculation": speculate,
+        "turn_p50_ms": round(statistics.median(latencies), 1),
+        "turn_max_ms": round(max(latencies), 1),
+        "llm_calls": ai.calls,
+        **{key: round(value, 3) for key, value in executor.stats.items()},
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Seconds per LLM request")
+    parser.add_argument("--stable-ms", type=int, default=300)
+    parser.add_argument("--endpoint-delay", type=float, default=0.8,
+                        help="Seconds from the last word to the final transcript")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = [asyncio.run(_run(speculate, args)) for speculate in (False, True)]
+    for result in results:
+        print(f"speculation={str(result['speculation']):<5}: turn p50 {result['turn_p50_ms']:>7.1f} ms, "
+              f"max {result['turn_max_ms']:>7.1f} ms, {result['llm_calls']} LLM calls "
+              f"(committed {result['committed']}, cancelled {result['cancelled']}, "
+              f"saved {result['saved_s']}s, wasted {result['wasted_s']}s)")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Time to first ``/health`` 200 and to ``/health/ready``.
+
+Starts ``uvicorn backend.main:app`` in a fresh process, polls the liveness
+and readiness endpoints, then prints the server's own startup profile
+(per-import and per-component times from ``/health/startup``).
+
+    python -m benchmarks.bench_startup --runs 3
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.bench_workers import REQUEST
+
+
+async def _get(host: str, port: int, path: str) -> Optional[bytes]:
+    """GET ``path``; returns the body on 200, None otherwise."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        return None
+    try:
+        writer.write(REQUEST.replace(b"{path}", path.encode()).replace(b"{host}", host.encode()))
+        status_line = await reader.readline()
+        if not status_line or int(status_line.split()[1]) != 200:
+            return None
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value.strip())
+        return await reader.readexactly(length)
+    except (ConnectionError, asyncio.IncompleteReadError):
+        return None
+    finally:
+        writer.close()
+
+
+async def _poll(host: str, port: int, path: str, start: float, timeout: float) -> float:
+    while time.perf_counter() - start < timeout:
+        if await _get(host, port, path) is not None:
+            return time.perf_counter() - start
+        await asyncio.sleep(0.01)
+    raise TimeoutError(f"{path} did not return 200 within {timeout}s")
+
+
+def measure_once(args) -> Dict[str, Any]:
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", args.host, "--port", str(args.port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        live = asyncio.run(_poll(args.host, args.port, "/health", start, args.timeout))
+        ready = asyncio.run(_poll(args.host, args.port, "/health/ready", start, args.timeout))
+        profile = asyncio.run(_get(args.host, args.port, "/health/startup"))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return {"live_s": round(live, 3), "ready_s": round(ready, 3), "profile": json.loads(profile or b"{}")}
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8012)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    runs = [measure_once(args) for _ in range(args.runs)]
+    summary = {
+        "live_s_median": statistics.median(run["live_s"] for run in runs),
+        "ready_s_median": statistics.median(run["ready_s"] for run in runs),
+        "runs": runs,
+    }
+    print(f"first /health 200: {summary['live_s_median']:.3f}s (median of {args.runs})")
+    print(f"/health/ready 200: {summary['ready_s_median']:.3f}s")
+    print(json.dumps(runs[-1]["profile"], indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Upstream weather calls per minute under N polling clients.
+
+Runs ``WeatherService`` against a local WeatherAPI stub and has N clients
+poll a handful of locations, comparing client requests with the calls that
+actually reached the provider. Without the cache every poll would be an
+upstream call.
+
+    python -m benchmarks.bench_weather --clients 1 10 100 --duration 30 --ttl 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from backend.services.weather import WeatherService
+from benchmarks.stubs import WeatherStub
+
+LOCATIONS = ("London", "Mumbai", "New York", "Tokyo")
+
+
+async def _run(clients: int, args, stub: WeatherStub) -> Dict[str, Any]:
+    service = WeatherService({"api_key": "benchmark", "base_url": stub.url, "ttl": args.ttl})
+    pushes = 0
+
+    async def on_update(location, data):
+        nonlocal pushes
+        pushes += 1
+
+    service.on_update = on_update
+    await service.start()
+    requests = 0
+    latencies: List[float] = []
+    deadline = time.perf_counter() + args.duration
+
+    async def client(index: int):
+        nonlocal requests
+        rng = random.Random(index)
+        # Spread first polls over one interval, like clients connecting over time
+        await asyncio.sleep(rng.uniform(0, args.poll_interval))
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await service.get_weather(rng.choice(LOCATIONS[:args.locations]))
+            latencies.append((time.perf_counter() - start) * 1000)
+            requests += 1
+            await asyncio.sleep(args.poll_interval)
+
+    start_calls = stub.requests
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    await service.stop()
+
+    upstream = stub.requests - start_calls
+    latencies.sort()
+    return {
+        "clients": clients,
+        "client_requests": requests,
+        "upstream_calls": upstream,
+        "upstream_per_minute": round(upstream * 60 / elapsed, 2),
+        "client_requests_per_minute": round(requests * 60 / elapsed, 2),
+        "pushes": pushes,
+        "latency_p50_ms": round(latencies[len(latencies) // 2], 3) if latencies else None,
+        "latency_p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 3) if latencies else None,
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls per client")
+    parser.add_argument("--ttl", type=float, default=10.0, help="Cache TTL in seconds")
+    parser.add_argument("--locations", type=int, default=2, choices=range(1, len(LOCATIONS) + 1))
+    parser.add_argument("--stub-latency", type=float, default=0.2)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = []
+    with WeatherStub(latency=args.stub_latency) as stub:
+        for clients in args.clients:
+            result = asyncio.run(_run(clients, args, stub))
+            results.append(result)
+            print(f"{clients:>5} clients: {result['client_requests_per_minute']:>9.1f} polls/min -> "
+                  f"{result['upstream_per_minute']:>6.1f} upstream calls/min, p50 {result['latency_p50_ms']} ms")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
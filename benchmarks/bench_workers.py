@@ -0,0 +1,122 @@
+"""Requests per second on 1 vs N gunicorn workers.
+
+Starts the backend under gunicorn (backend/gunicorn_conf.py) once per worker
+count and drives ``/health`` with keep-alive HTTP/1.1 connections.
+
+    python -m benchmarks.bench_workers --workers 1 4 --connections 64 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+REQUEST = b"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n"
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed the connection")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value.strip())
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host: str, port: int, path: str, deadline: float, counts: Dict[str, int]):
+    request = REQUEST.replace(b"{path}", path.encode()).replace(b"{host}", host.encode())
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(request)
+            status = await _read_response(reader)
+            counts["ok" if status == 200 else "failed"] += 1
+    except (ConnectionError, asyncio.IncompleteReadError):
+        counts["failed"] += 1
+    finally:
+        writer.close()
+
+
+async def drive(host: str, port: int, path: str, connections: int, duration: float) -> Dict[str, Any]:
+    """Run ``connections`` keep-alive clients against one endpoint.
+
+    Returns:
+        Dict: Request counts and requests per second
+    """
+    counts = {"ok": 0, "failed": 0}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_client(host, port, path, deadline, counts) for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    return {**counts, "elapsed_s": round(elapsed, 3), "rps": round(counts["ok"] / elapsed, 1)}
+
+
+async def _wait_ready(host: str, port: int, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(REQUEST.replace(b"{path}", b"/health/ready").replace(b"{host}", host.encode()))
+            if await _read_response(reader) == 200:
+                writer.close()
+                return
+            writer.close()
+        except (OSError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        await asyncio.sleep(0.25)
+    raise TimeoutError("Server did not become ready")
+
+
+def run_for_workers(workers: int, args) -> Dict[str, Any]:
+    env = dict(os.environ, JARVIS_WORKERS=str(workers), JARVIS_BIND=f"{args.host}:{args.port}")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "backend/gunicorn_conf.py", "backend.main:app"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(_wait_ready(args.host, args.port))
+        result = asyncio.run(drive(args.host, args.port, args.path, args.connections, args.duration))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return {"workers": workers, **result}
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 2])
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = [run_for_workers(workers, args) for workers in args.workers]
+    base = results[0]["rps"] or 1.0
+    for result in results:
+        result["speedup"] = round(result["rps"] / base, 2)
+        print(f"{result['workers']:>3} worker(s): {result['rps']:>10.1f} req/s "
+              f"({result['speedup']:.2f}x, {result['failed']} failed)")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""Replay recorded voice sessions against the backend as a load generator.
+
+Sessions are recorded by the server (set ``JARVIS_RECORD_DIR``; see
+backend/services/session_recorder.py) or made from the benchmark audio
+fixtures with ``make``. ``run`` replays them at a sweep of concurrency
+levels, each simulated client streaming one session after another:
+
+- ``socketio``: audio_start, the recorded frames with their original
+  timing divided by ``--speed`` (0 sends as fast as possible), audio_end
+- ``http``: the same audio as one WAV upload to /api/process_voice
+
+Per level it reports throughput, client-side latency percentiles per stage
+(connect, first_partial, final_transcript, response, turn,
+http_process_voice) and server-side stage latencies taken from /metrics,
+and names the knee: the first level whose p90 turn latency exceeds
+``--knee-factor`` times that of the lowest level.
+
+Without ``--url`` the backend is started by ``benchmarks.replay_server``
+with stubbed Gemini and SystemController backends.
+
+    python -m benchmarks.replay make --output recordings/
+    python -m benchmarks.replay run recordings/ --concurrency 1 2 4 8 16 --speed 1
+    python -m benchmarks.replay run recordings/ --url http://127.0.0.1:8000 --target http
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.services.audio_stream import CODEC_PCM16, FRAME_HEADER, encode_frame
+from backend.services.session_recorder import Recording, read_recording, write_recording
+from benchmarks.fixtures import SAMPLE_RATE, recorded_clips, synthetic_speech, to_wav
+from benchmarks.run import summarize
+
+BUCKET_LINE = re.compile(r'^jarvis_stage_latency_seconds_(bucket|sum|count)\{stage="([^"]+)"(?:,le="([^"]+)")?\} (\S+)$')
+
+
+class ReplayError(Exception):
+    """A replayed turn failed (error event, non-200 response, timeout)."""
+
+
+def load_recordings(paths: List[str]) -> List[Tuple[str, Recording]]:
+    files: List[str] = []
+    for path in paths:
+        files.extend(sorted(glob.glob(os.path.join(path, "*.jvr"))) if os.path.isdir(path) else [path])
+    return [(file, read_recording(file)) for file in files]
+
+
+def recording_wav(recording: Recording) -> Optional[bytes]:
+    """The session's audio as a WAV upload (PCM16 sessions only)."""
+    if recording.meta.get("codec", "pcm16") != "pcm16":
+        return None
+    return to_wav(b"".join(frame[FRAME_HEADER.size:] for _, frame in recording.frames))
+
+
+async def socketio_turn(url: str, recording: Recording, speed: float, timeout: float) -> Dict[str, float]:
+    import socketio
+
+    client = socketio.AsyncClient(reconnection=False)
+    loop = asyncio.get_running_loop()
+    first_partial = loop.create_future()
+    transcript = loop.create_future()
+    response = loop.create_future()
+    error = loop.create_future()
+
+    def resolve(future: asyncio.Future, value: Any):
+        if not future.done():
+            future.set_result(value)
+
+    client.on('transcript_partial', lambda data: resolve(first_partial, time.perf_counter()))
+    client.on('transcript', lambda data: resolve(transcript, (time.perf_counter(), data)))
+    client.on('assistant_response', lambda data: resolve(response, (time.perf_counter(), data)))
+    client.on('audio_error', lambda data: resolve(error, data))
+
+    async def wait_for(future: asyncio.Future):
+        await asyncio.wait([future, error], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        if error.done():
+            raise ReplayError(error.result().get("error_code") or "AUDIO_ERROR")
+        if not future.done():
+            raise ReplayError("TIMEOUT")
+        return future.result()
+
+    stages: Dict[str, float] = {}
+    start = time.perf_counter()
+    await client.connect(url, transports=["websocket"])
+    stages["connect"] = (time.perf_counter() - start) * 1000
+    try:
+        meta = recording.meta
+        await client.emit('audio_start', {"codec": meta.get("codec", "pcm16"), "frame_ms": meta.get("frame_ms", 20),
+                                          "language": meta.get("language", "en")})
+        start = time.perf_counter()
+        for offset_ms, frame in recording.frames:
+            if speed:
+                delay = start + offset_ms / 1000 / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await client.emit('audio_frame', frame)
+        end = time.perf_counter()
+        await client.emit('audio_end')
+
+        transcript_at, data = await wait_for(transcript)
+        stages["final_transcript"] = (transcript_at - end) * 1000
+        if first_partial.done():
+            stages["first_partial"] = (first_partial.result() - start) * 1000
+        if recording.final is not None:
+            stages["transcript_match"] = float(data.get("text") == recording.final[1])
+        if data.get("status") == "success":
+            response_at, result = await wait_for(response)
+            stages["response"] = (response_at - transcript_at) * 1000
+            stages["turn"] = (response_at - end) * 1000
+            stages["speculative"] = float(bool(result.get("speculative")))
+    finally:
+        await client.disconnect()
+    return stages
+
+
+async def http_turn(client, wav: bytes) -> Dict[str, float]:
+    start = time.perf_counter()
+    response = await client.post("/api/process_voice", files={"audio_file": ("recording.wav", wav, "audio/wav")})
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code != 200:
+        raise ReplayError(f"HTTP_{response.status_code}")
+    if response.json().get("status") != "success":
+        raise ReplayError(response.json().get("error_code") or "NO_TRANSCRIPT")
+    return {"http_process_voice": elapsed}
+
+
+def parse_stage_metrics(text: str) -> Dict[str, Dict[str, Any]]:
+    """Stage histograms from a /metrics scrape: {stage: {"buckets": {le: n}, "sum": s, "count": n}}."""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for line in text.splitlines():
+        match = BUCKET_LINE.match(line)
+        if not match:
+            continue
+        kind, stage, le, value = match.groups()
+        entry = stages.setdefault(stage, {"buckets": {}, "sum": 0.0, "count": 0})
+        if kind == "bucket":
+            entry["buckets"][le] = float(value)
+        else:
+            entry[kind] = float(value)
+    return stages
+
+
+def stage_metrics_delta(before: Dict[str, Dict[str, Any]], after: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-stage count, mean and bucketed p50/p90 for the observations between two scrapes."""
+    result = {}
+    for stage, entry in after.items():
+        previous = before.get(stage, {"buckets": {}, "sum": 0.0, "count": 0})
+        count = entry["count"] - previous["count"]
+        if count <= 0:
+            continue
+        buckets = sorted(((float(le), seen - previous["buckets"].get(le, 0)) for le, seen in entry["buckets"].items()))
+
+        def upper_bound(q: float) -> Optional[float]:
+            for le, seen in buckets:
+                if seen >= q * count:
+                    # None: beyond the largest finite boundary
+                    return le * 1000 if le != float("inf") else None
+            return None
+
+        result[stage] = {
+            "n": int(count),
+            "mean_ms": round((entry["sum"] - previous["sum"]) / count * 1000, 2),
+            # Bucket upper bounds, as coarse as the exported boundaries
+            "p50_ms_le": upper_bound(0.5),
+            "p90_ms_le": upper_bound(0.9),
+        }
+    return result
+
+
+async def run_level(args, recordings: List[Tuple[str, Recording]], concurrency: int) -> Dict[str, Any]:
+    import httpx
+
+    samples: Dict[str, List[float]] = {}
+    errors: Counter = Counter()
+    turns = 0
+    wavs = [recording_wav(recording) for _, recording in recordings]
+    if args.target == "http":
+        # Opus sessions have no WAV form
+        recordings = [pair for pair, wav in zip(recordings, wavs) if wav is not None]
+        wavs = [wav for wav in wavs if wav is not None]
+    deadline = time.perf_counter() + args.duration
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as http:
+        async def scrape() -> Dict[str, Dict[str, Any]]:
+            try:
+                return parse_stage_metrics((await http.get("/metrics")).text)
+            except httpx.HTTPError:
+                return {}
+
+        async def client(index: int):
+            nonlocal turns
+            position = index
+            while time.perf_counter() < deadline:
+                _, recording = recordings[position % len(recordings)]
+                wav = wavs[position % len(recordings)]
+                position += 1
+                try:
+                    if args.target in ("socketio", "both"):
+                        stages = await socketio_turn(args.url, recording, args.speed, args.timeout)
+                    else:
+                        stages = {}
+                    if args.target in ("http", "both") and wav is not None:
+                        stages.update(await http_turn(http, wav))
+                except Exception as e:
+                    errors[str(e) if isinstance(e, ReplayError) else type(e).__name__] += 1
+                    continue
+                turns += 1
+                for stage, value in stages.items():
+                    samples.setdefault(stage, []).append(value)
+
+        before = await scrape()
+        start = time.perf_counter()
+        await asyncio.gather(*(client(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        after = await scrape()
+
+    rates = {name: round(sum(samples.pop(name, [])) / max(1, turns), 3) for name in ("transcript_match", "speculative")}
+    return {
+        "concurrency": concurrency,
+        "turns": turns,
+        "throughput_per_s": round(turns / elapsed, 3),
+        "errors": dict(errors),
+        **rates,
+        "stages": {stage: summarize(values) for stage, values in samples.items()},
+        "server_stages": stage_metrics_delta(before, after),
+    }
+
+
+def find_knee(levels: List[Dict[str, Any]], stage: str, factor: float) -> Optional[int]:
+    """First concurrency whose p90 for ``stage`` exceeds ``factor`` times the lowest level's."""
+    baseline = next((level["stages"][stage]["p90_ms"] for level in levels if stage in level["stages"]), None)
+    if not baseline:
+        return None
+    for level in levels:
+        if stage in level["stages"] and level["stages"][stage]["p90_ms"] > factor * baseline:
+            return level["concurrency"]
+    return None
+
+
+def _wait_ready(url: str, timeout: float):
+    import httpx
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(f"{url}/health/ready", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"{url} was not ready within {timeout}s")
+
+
+def run(args) -> Dict[str, Any]:
+    recordings = load_recordings(args.recordings)
+    if not recordings:
+        raise SystemExit("No recordings found")
+    apps = sorted({result["target"] for _, recording in recordings
+                   for _, result in recording.results if result.get("type") == "command"})
+
+    server = None
+    if not args.url:
+        args.url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.replay_server", "--port", str(args.port),
+             "--llm-latency", str(args.llm_latency), "--system-latency", str(args.system_latency),
+             "--apps", *apps],
+        )
+    try:
+        _wait_ready(args.url, args.startup_timeout)
+        levels = []
+        for concurrency in args.concurrency:
+            level = asyncio.run(run_level(args, recordings, concurrency))
+            levels.append(level)
+            stage = "turn" if "turn" in level["stages"] else "http_process_voice"
+            stats = level["stages"].get(stage, {})
+            print(f"concurrency {concurrency:>4}: {level['throughput_per_s']:>7.2f} turns/s, "
+                  f"{stage} p50 {stats.get('p50_ms', float('nan')):>8.1f} ms "
+                  f"p90 {stats.get('p90_ms', float('nan')):>8.1f} ms, errors {level['errors']}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    knee_stage = "turn" if args.target != "http" else "http_process_voice"
+    knee = find_knee(levels, knee_stage, args.knee_factor)
+    print(f"knee ({knee_stage} p90 > {args.knee_factor}x lowest level): "
+          f"{'concurrency ' + str(knee) if knee else 'not reached'}")
+    return {"recordings": len(recordings), "speed": args.speed, "target": args.target, "knee": knee, "levels": levels}
+
+
+def make(args):
+    """Write recordings of the fixture clips, framed as the frontend streams them."""
+    os.makedirs(args.output, exist_ok=True)
+    clips = [(f"synthetic-{seconds:g}s", "en", synthetic_speech(seconds, seed=index))
+             for index, seconds in enumerate(args.seconds)]
+    for language, pcms in recorded_clips().items():
+        clips.extend((f"{language}-{index}", language, pcm) for index, pcm in enumerate(pcms))
+
+    frame_bytes = SAMPLE_RATE * args.frame_ms // 1000 * 2
+    for name, language, pcm in clips:
+        frames = [(seq * args.frame_ms, encode_frame(seq, pcm[i:i + frame_bytes], CODEC_PCM16, args.frame_ms))
+                  for seq, i in enumerate(range(0, len(pcm), frame_bytes))]
+        path = os.path.join(args.output, f"{name}.jvr")
+        write_recording(path, {"codec": "pcm16", "frame_ms": args.frame_ms, "language": language, "source": name},
+                        frames)
+        print(f"{path}: {len(frames)} frames, {os.path.getsize(path)} bytes")
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    make_parser = commands.add_parser("make", help="Write recordings from the benchmark audio fixtures")
+    make_parser.add_argument("--output", required=True)
+    make_parser.add_argument("--seconds", type=float, nargs="+", default=[1.5, 3.0, 5.0],
+                             help="Lengths of the synthetic clips")
+    make_parser.add_argument("--frame-ms", type=int, default=20)
+
+    run_parser = commands.add_parser("run", help="Replay recordings at increasing concurrency")
+    run_parser.add_argument("recordings", nargs="+", help="Recording files or directories of *.jvr files")
+    run_parser.add_argument("--url", help="Running backend to target (default: start benchmarks.replay_server)")
+    run_parser.add_argument("--port", type=int, default=8020, help="Port for the started backend")
+    run_parser.add_argument("--target", choices=("socketio", "http", "both"), default="socketio")
+    run_parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    run_parser.add_argument("--speed", type=float, default=1.0, help="Replay speed (1 = real time, 0 = no pacing)")
+    run_parser.add_argument("--duration", type=float, default=30.0, help="Seconds per concurrency level")
+    run_parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for each reply")
+    run_parser.add_argument("--knee-factor", type=float, default=2.0)
+    run_parser.add_argument("--llm-latency", type=float, default=0.8, help="Stubbed Gemini latency (seconds)")
+    run_parser.add_argument("--system-latency", type=float, default=0.05,
+                            help="Stubbed SystemController latency (seconds)")
+    run_parser.add_argument("--startup-timeout", type=float, default=120.0)
+    run_parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.command == "make":
+        make(args)
+        return
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
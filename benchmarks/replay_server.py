@@ -0,0 +1,46 @@
+"""The backend under test for ``benchmarks.replay``: ``backend.main`` with
+Gemini and the SystemController replaced by local stubs, so replayed turns
+exercise transcription, speculation and admission control without calling
+Google or touching the desktop.
+
+    python -m benchmarks.replay_server --port 8020 --llm-latency 0.8 --apps notepad browser
+"""
+import argparse
+import os
+from typing import List
+
+from benchmarks.stubs import GeminiStub, StubSystemController
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8020)
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Seconds per stubbed Gemini request")
+    parser.add_argument("--system-latency", type=float, default=0.05, help="Seconds per stubbed system command")
+    parser.add_argument("--apps", nargs="*", default=[], help="Applications voice commands may name")
+    parser.add_argument("--keep-rate-limits", action="store_true",
+                        help="Keep per-IP rate limits (every replayed client connects from one address)")
+    args = parser.parse_args(argv)
+
+    gemini = GeminiStub(latency=args.llm_latency).start()
+    # Read when backend.main builds its components; .env does not override these
+    os.environ["GEMINI_API_KEY"] = "replay"
+    os.environ["GEMINI_API_ENDPOINT"] = gemini.url
+
+    import uvicorn
+    from backend import main as server
+
+    server.components.register(
+        "system_controller", lambda: StubSystemController(args.apps, args.system_latency), required=False)
+    if not args.keep_rate_limits:
+        for limiter in server.admission.limiters.values():
+            limiter.rate = limiter.burst = 1e9
+    try:
+        uvicorn.run(server.app, host=args.host, port=args.port, log_level="warning")
+    finally:
+        gemini.stop()
+
+
+if __name__ == "__main__":
+    main()
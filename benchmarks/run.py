@@ -0,0 +1,315 @@
+"""Benchmark suite for the backend hot paths.
+
+    python -m benchmarks.run                              # all groups
+    python -m benchmarks.run --only stt memory --repeat 20
+    python -m benchmarks.run --output results.json --baseline benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline            # store a new baseline
+
+Groups whose dependencies (or Vosk models, audio stack, ...) are missing are
+reported as skipped; a group that raises anything else is reported as
+failed and the run exits with status 1. With ``--baseline`` the run also
+exits with status 1 when any case's p50 regressed by more than
+``--threshold`` (default 15%).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.fixtures import recorded_clips, silence, synthetic_speech, to_wav
+from benchmarks.stubs import GeminiStub
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+CLIP_SECONDS = (1, 3, 5, 10)
+
+Stats = Dict[str, Any]
+GROUPS: Dict[str, Callable[[argparse.Namespace], Dict[str, Stats]]] = {}
+
+
+class SkipGroup(Exception):
+    """Raised by a group whose environment (Vosk models, audio stack) is missing."""
+
+
+def group(name: str):
+    """Register a benchmark group."""
+    def decorator(func):
+        GROUPS[name] = func
+        return func
+    return decorator
+
+
+def summarize(samples_ms: List[float], **extra) -> Stats:
+    """Reduce raw samples (milliseconds) to summary statistics."""
+    ordered = sorted(samples_ms)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 4),
+        "p50_ms": round(pick(0.5), 4),
+        "p90_ms": round(pick(0.9), 4),
+        "p99_ms": round(pick(0.99), 4),
+        "min_ms": round(ordered[0], 4),
+        **extra,
+    }
+
+
+def measure(func: Callable, repeat: int, batch: int = 1) -> Stats:
+    """Time ``func`` ``repeat`` times; with ``batch`` > 1 each sample is the
+    mean of ``batch`` back-to-back calls (for sub-microsecond operations)."""
+    func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(batch):
+            func()
+        samples.append((time.perf_counter() - start) * 1000 / batch)
+    return summarize(samples)
+
+
+async def measure_async(func: Callable, repeat: int) -> Stats:
+    await func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+_voice_processor = None
+
+
+def get_voice_processor():
+    global _voice_processor
+    if _voice_processor is None:
+        from backend.core.voice_processing import VoiceProcessor
+        try:
+            _voice_processor = VoiceProcessor({"wake_word": "Hey JARVIS"})
+        except ImportError:
+            raise
+        except Exception as e:
+            raise SkipGroup(f"Vosk models unavailable: {e}") from e
+    return _voice_processor
+
+
+@group("stt")
+def bench_stt(args) -> Dict[str, Stats]:
+    """VoiceProcessor.transcribe: en vs hi model over a clip length sweep."""
+    processor = get_voice_processor()
+    results = {}
+    for language in ("en", "hi"):
+        for seconds in CLIP_SECONDS:
+            clip = synthetic_speech(seconds, seed=seconds)
+            stats = asyncio.run(measure_async(lambda: processor.transcribe(clip, language=language), args.repeat))
+            stats["realtime_factor"] = round(stats["p50_ms"] / (seconds * 1000), 4)
+            results[f"transcribe.{language}.synthetic_{seconds}s"] = stats
+        quiet = silence(3)
+        results[f"transcribe.{language}.silence_3s"] = asyncio.run(
+            measure_async(lambda: processor.transcribe(quiet, language=language), args.repeat)
+        )
+    # Auto-detection path (en first, hi retry) on recorded speech
+    for language, clips in recorded_clips().items():
+        for index, clip in enumerate(clips):
+            results[f"transcribe.auto.recorded_{language}_{index}"] = asyncio.run(
+                measure_async(lambda: processor.transcribe(clip), args.repeat)
+            )
+    return results
+
+
+@group("recognizer")
+def bench_recognizer(args) -> Dict[str, Stats]:
+    """Per-utterance KaldiRecognizer construction."""
+    processor = get_voice_processor()
+    return {
+        f"create.{language}": measure(lambda: processor.create_recognizer(language), args.repeat * 5)
+        for language in ("en", "hi")
+    }
+
+
+@group("memory")
+def bench_memory(args) -> Dict[str, Stats]:
+    """MemoryManager operations at small and large history sizes."""
+    from backend.core.ai_integration import MemoryManager
+    results = {}
+    for size in (10, 100, 1000):
+        memory = MemoryManager(max_memory_size=size)
+        for i in range(size):
+            memory.add_interaction(f"question {i}", f"answer {i}")
+        results[f"add_interaction.full_{size}"] = measure(
+            lambda: memory.add_interaction("what time is it", "It is noon."), args.repeat, batch=1000
+        )
+        results[f"get_history.full_{size}"] = measure(memory.get_conversation_history, args.repeat, batch=1000)
+    return results
+
+
+@group("system")
+def bench_system(args) -> Dict[str, Stats]:
+    """SystemController process lookups and system info."""
+    from backend.core.system_control import SystemController
+    controller = SystemController({})
+    return {
+        # A name that never matches walks the whole process table without killing anything
+        "close_application.lookup_miss": measure(
+            lambda: controller.close_application("jarvis-benchmark-no-such-process"), args.repeat
+        ),
+        "get_running_applications": measure(controller.get_running_applications, args.repeat),
+        # Includes psutil.cpu_percent(interval=1), a 1 s blocking sample
+        "get_system_info": measure(controller.get_system_info, max(2, args.repeat // 10)),
+    }
+
+
+@group("llm")
+def bench_llm(args) -> Dict[str, Stats]:
+    """GeminiAI.generate against a local stub of the Gemini REST API."""
+    from backend.core.ai_integration import GeminiAI
+    with GeminiStub(latency=args.stub_latency) as stub:
+        # Sentiment analysis would load transformers and a Hugging Face model
+        ai = GeminiAI({"gemini_api_key": "benchmark", "api_endpoint": stub.url, "sentiment_analysis": False})
+        stats = asyncio.run(measure_async(lambda: ai.generate("Open the browser"), args.repeat))
+        stats["stub_latency_ms"] = args.stub_latency * 1000
+        return {"generate.stub": stats}
+
+
+async def _api_load(app, body: bytes, concurrency: int, requests: int) -> Stats:
+    import httpx
+    transport = httpx.ASGITransport(app=app)
+    latencies: List[float] = []
+    remaining = requests
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/process_voice", files={"audio_file": ("clip.wav", body, "audio/wav")}
+                )
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, concurrency=concurrency, rps=round(len(latencies) / elapsed, 2))
+
+
+@group("api")
+def bench_api(args) -> Dict[str, Stats]:
+    """Concurrent load on /api/process_voice through an in-process ASGI client."""
+    from backend.main import admission, app, components
+    # Every request comes from the one ASGI client address; the per-IP rate
+    # limit would shed the load being measured (as in replay_server)
+    for limiter in admission.limiters.values():
+        limiter.rate = limiter.burst = 1e9
+    # The ASGI client does not run the lifespan, so build components here
+    components.build()
+    if components.get("voice_processor") is None:
+        raise SkipGroup(f"Vosk models unavailable: {components.errors.get('voice_processor')}")
+    body = to_wav(synthetic_speech(3, seed=3))
+    return {
+        f"process_voice.c{concurrency}": asyncio.run(
+            _api_load(app, body, concurrency, max(args.repeat, concurrency * 4))
+        )
+        for concurrency in args.concurrency
+    }
+
+
+def compare(results: Dict[str, Dict[str, Stats]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """List cases whose p50 regressed by more than ``threshold`` vs the baseline."""
+    regressions = []
+    for group_name, cases in results.items():
+        for case, stats in cases.items():
+            previous = baseline.get("results", {}).get(group_name, {}).get(case)
+            if not previous or "p50_ms" not in stats or "p50_ms" not in previous:
+                continue
+            change = (stats["p50_ms"] - previous["p50_ms"]) / max(previous["p50_ms"], 1e-9)
+            stats["p50_change"] = round(change, 4)
+            if change > threshold:
+                regressions.append(
+                    f"{group_name}/{case}: p50 {previous['p50_ms']:.3f} -> {stats['p50_ms']:.3f} ms ({change:+.1%})"
+                )
+    return regressions
+
+
+def _metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(args) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Stats]] = {}
+    for name in args.only or list(GROUPS):
+        print(f"== {name}", file=sys.stderr)
+        try:
+            results[name] = GROUPS[name](args)
+        except ImportError as e:
+            results[name] = {"skipped": {"reason": f"missing dependency: {e}"}}
+        except SkipGroup as e:
+            results[name] = {"skipped": {"reason": str(e)}}
+        except Exception as e:
+            # A bug, not a missing dependency: report it and fail the run
+            traceback.print_exc()
+            results[name] = {"failed": {"reason": f"{type(e).__name__}: {e}"}}
+    return {"meta": _metadata(), "results": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(GROUPS), help="Groups to run")
+    parser.add_argument("--repeat", type=int, default=10, help="Samples per case")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="Gemini stub delay in seconds")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this results file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed p50 regression (fraction)")
+    parser.add_argument("--update-baseline", action="store_true", help=f"Write results to {DEFAULT_BASELINE}")
+    args = parser.parse_args(argv)
+    if args.baseline and not os.path.exists(args.baseline):
+        # Checked before the run: a typo should not cost a full benchmark pass
+        parser.error(f"baseline {args.baseline} not found; record one on this machine with --update-baseline")
+
+    report = run(args)
+    for group_name, cases in report["results"].items():
+        for case, stats in cases.items():
+            if case in ("skipped", "failed"):
+                print(f"{group_name:<10} {case}: {stats['reason']}")
+            else:
+                print(f"{group_name:<10} {case:<40} p50 {stats['p50_ms']:>10.4f} ms  p99 {stats['p99_ms']:>10.4f} ms")
+
+    status = 1 if any("failed" in cases for cases in report["results"].values()) else 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report["results"], json.load(f), args.threshold)
+        report["regressions"] = regressions
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        status = 1 if regressions else status
+
+    for path in filter(None, [args.output, DEFAULT_BASELINE if args.update_baseline else None]):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Local stand-ins for external services used by the benchmarks.
+
+``StubServer`` is a minimal HTTP/1.1 server running on its own thread and
+event loop, so it never competes with the code under test for the loop.
+"""
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# (status, JSON body) returned by a route handler
+Response = Tuple[int, Dict[str, Any]]
+
+
+class StubServer:
+    """Serves canned JSON responses with a configurable delay."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        """Initialize the stub.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency: Seconds to wait before answering each request
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.requests = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def handle(self, method: str, path: str, query: Dict[str, Any], body: bytes) -> Response:
+        """Build the response for a request; override in subclasses."""
+        return 404, {"error": {"code": 404, "message": f"No stub for {method} {path}"}}
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                parsed = urlparse(target)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                status, payload = self.handle(method, parsed.path, query, body)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(asyncio.start_server(self._serve, self.host, self.port))
+        self.port = self.server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self.loop.run_forever()
+
+    def start(self) -> "StubServer":
+        threading.Thread(target=self._run, name=type(self).__name__, daemon=True).start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.server.close)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class WeatherStub(StubServer):
+    """Answers WeatherAPI ``/current.json`` calls; the temperature changes
+    on every call so refreshes are visible to subscribers."""
+
+    def handle(self, method, path, query, body):
+        if method == "GET" and path.endswith("/current.json"):
+            return 200, {
+                "location": {"name": query.get("q", "").title()},
+                "current": {
+                    "temp_c": 20 + self.requests % 10,
+                    "condition": {"text": "Partly cloudy"},
+                    "humidity": 55,
+                    "wind_kph": 12.0,
+                    "last_updated": "2024-01-01 12:00",
+                },
+            }
+        return super().handle(method, path, query, body)
+
+
+class GeminiStub(StubServer):
+    """Answers Gemini REST ``generateContent`` calls with a fixed reply, and
+    ``countTokens`` calls (GeminiAI.warm).
+
+    Point ``GeminiAI`` at it with ``{"api_endpoint": stub.url}``.
+    """
+
+    def __init__(self, reply: str = "Certainly. Opening the browser now.", **kwargs):
+        super().__init__(**kwargs)
+        self.reply = reply
+
+    def handle(self, method, path, query, body):
+        if method == "POST" and path.endswith(":generateContent"):
+            return 200, {
+                "candidates": [{
+                    "content": {"role": "model", "parts": [{"text": self.reply}]},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }],
+                "usageMetadata": {"promptTokenCount": 8, "candidatesTokenCount": 8, "totalTokenCount": 16},
+            }
+        if method == "POST" and path.endswith(":countTokens"):
+            return 200, {"totalTokens": 2}
+        return super().handle(method, path, query, body)
+
+
+
+class StubSystemController:
+    """SystemController stand-in that records commands instead of running them.
+
+    Implements the methods voice turns use (see backend/services/speculation.py),
+    each taking ``latency`` seconds, like a process table walk or a launch.
+    """
+
+    def __init__(self, app_names: Iterable[str] = (), latency: float = 0.0):
+        """Initialize the stub.
+
+        Args:
+            app_names: Applications that voice commands may name
+            latency: Seconds each call blocks (they run on executor threads)
+        """
+        self.app_paths = {name.lower(): name for name in app_names}
+        self.latency = latency
+        self.calls: List[Tuple[str, str]] = []
+
+    def _call(self, action: str, target: str) -> bool:
+        self.calls.append((action, target))
+        if self.latency:
+            time.sleep(self.latency)
+        return target.lower() in self.app_paths
+
+    def prefetch(self, action: str, target: str):
+        self._call("prefetch", target)
+
+    def launch_application(self, app_name: str) -> bool:
+        return self._call("launch_application", app_name)
+
+    def close_application(self, app_name: str) -> bool:
+        return self._call("close_application", app_name)
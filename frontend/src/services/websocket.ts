@@ -1,8 +1,16 @@
 import { io, Socket } from 'socket.io-client';
 
+// Binary audio frame header, must match backend/services/audio_stream.py:
+// codec (u8), flags (u8), duration in ms (u16), sequence number (u32), big-endian
+const FRAME_HEADER_SIZE = 8;
+const AUDIO_CODECS = { pcm16: 0, opus: 1 } as const;
+type AudioCodec = keyof typeof AUDIO_CODECS;
+
 class WebSocketService {
     private socket: Socket | null = null;
     private static instance: WebSocketService;
+    private audioSeq = 0;
+    private audioCodec: AudioCodec = 'pcm16';
 
     private constructor() {
         this.initializeSocket();
@@ -16,8 +24,10 @@ class WebSocketService {
     }
 
     private initializeSocket() {
+        // Websocket first: binary audio frames go out as-is instead of being
+        // base64-encoded into long-polling requests
         this.socket = io('http://localhost:8000', {
-            transports: ['polling', 'websocket'],
+            transports: ['websocket'],
             autoConnect: true,
             reconnection: true,
             reconnectionAttempts: 5,
@@ -32,11 +42,44 @@ class WebSocketService {
             console.log('Disconnected from WebSocket server');
         });
 
+        this.socket.on('connect_error', () => {
+            // Fall back to long-polling (then upgrade) if websockets are blocked
+            if (this.socket && this.socket.io.opts.transports?.[0] === 'websocket') {
+                this.socket.io.opts.transports = ['polling', 'websocket'];
+            }
+        });
+
         this.socket.on('error', (error: Error) => {
             console.error('WebSocket error:', error);
         });
     }
 
+    public startAudioStream(codec: AudioCodec = 'pcm16', language = 'en', frameMs = 20) {
+        this.audioSeq = 0;
+        this.audioCodec = codec;
+        this.socket?.emit('audio_start', { codec, language, frame_ms: frameMs });
+    }
+
+    // payload: 16 kHz mono little-endian int16 PCM (or one Opus packet)
+    public sendAudioFrame(payload: ArrayBuffer, durationMs = 20) {
+        if (!this.socket || !this.socket.connected) {
+            return;
+        }
+        const frame = new Uint8Array(FRAME_HEADER_SIZE + payload.byteLength);
+        const header = new DataView(frame.buffer);
+        header.setUint8(0, AUDIO_CODECS[this.audioCodec]);
+        header.setUint8(1, 0);
+        header.setUint16(2, durationMs);
+        header.setUint32(4, this.audioSeq++);
+        frame.set(new Uint8Array(payload), FRAME_HEADER_SIZE);
+        // Socket.IO sends the ArrayBuffer as a binary attachment
+        this.socket.emit('audio_frame', frame.buffer);
+    }
+
+    public endAudioStream() {
+        this.socket?.emit('audio_end');
+    }
+
     public sendMessage(message: string) {
         if (this.socket && this.socket.connected) {
             this.socket.emit('message', message);
@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# backend.utils.error_handler starts the logging pipeline at import; keep
+# the test run's log file out of the working tree
+os.environ["LOG_FILE"] = os.path.join(tempfile.mkdtemp(prefix="jarvis-tests-"), "jarvis.log")
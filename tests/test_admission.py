@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from backend.utils.admission import (
+    PRIORITY_BATCH, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, RateLimiter, ResourcePool, TokenBucket
+)
+from backend.utils.error_handler import AdmissionError
+
+
+def test_token_bucket_allows_burst_then_reports_delay():
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    delay = bucket.take()
+    assert 0 < delay <= 0.1
+
+
+def test_rate_limiter_evicts_least_recently_used_key():
+    limiter = RateLimiter(rate=1, burst=1, max_keys=2)
+    limiter.check("a")
+    limiter.check("b")
+    limiter.check("a")
+    limiter.check("c")
+    assert list(limiter.buckets) == ["a", "c"]
+    assert limiter.check("a") > 0
+
+
+def test_reserved_slot_is_kept_for_interactive_work():
+    pool = ResourcePool("stt", 2, reserved=1)
+    assert pool.try_acquire(PRIORITY_BATCH)
+    assert not pool.try_acquire(PRIORITY_BATCH)
+    assert not pool.try_acquire(PRIORITY_NORMAL)
+    assert pool.try_acquire(PRIORITY_INTERACTIVE)
+
+
+def test_waiters_are_served_by_priority():
+    async def scenario():
+        pool = ResourcePool("stt", 1, reserved=0)
+        await pool.acquire()
+        order = []
+
+        async def wait(name, priority):
+            async with pool.slot(priority):
+                order.append(name)
+
+        tasks = [asyncio.ensure_future(wait("batch", PRIORITY_BATCH)),
+                 asyncio.ensure_future(wait("normal", PRIORITY_NORMAL)),
+                 asyncio.ensure_future(wait("interactive", PRIORITY_INTERACTIVE))]
+        await asyncio.sleep(0)
+        pool.release()
+        await asyncio.gather(*tasks)
+        return order, pool.in_use
+
+    assert asyncio.run(scenario()) == (["interactive", "normal", "batch"], 0)
+
+
+def test_timed_out_waiters_do_not_fill_the_queue():
+    async def scenario():
+        pool = ResourcePool("llm", 1, reserved=0, max_queue=2, queue_timeout=0.01)
+        await pool.acquire()
+        for _ in range(5):
+            with pytest.raises(AdmissionError) as info:
+                await pool.acquire()
+            assert info.value.details["reason"] == "queue_timeout"
+        return len(pool.waiters)
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_cancelled_waiters_leave_the_queue():
+    async def scenario():
+        pool = ResourcePool("llm", 1, reserved=0, max_queue=2)
+        await pool.acquire()
+        # A live waiter at the head of the queue, cancelled ones behind it
+        head = asyncio.ensure_future(pool.acquire(PRIORITY_INTERACTIVE))
+        for _ in range(3):
+            task = asyncio.ensure_future(pool.acquire(PRIORITY_BATCH))
+            await asyncio.sleep(0)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        queued = len(pool.waiters)
+        # The queue still has room for one more
+        waiter = asyncio.ensure_future(pool.acquire(PRIORITY_BATCH))
+        await asyncio.sleep(0)
+        pool.release()
+        await head
+        pool.release()
+        await waiter
+        return queued, len(pool.waiters), pool.in_use
+
+    assert asyncio.run(scenario()) == (1, 0, 1)
+
+
+def test_full_queue_sheds():
+    async def scenario():
+        pool = ResourcePool("stt", 1, reserved=0, max_queue=1)
+        await pool.acquire()
+        waiter = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionError) as info:
+            await pool.acquire()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        return info.value
+
+    error = asyncio.run(scenario())
+    assert error.details["reason"] == "queue_full"
+
+
+def test_run_in_executor_holds_the_slot_until_the_thread_ends():
+    import threading
+
+    async def scenario():
+        pool = ResourcePool("stt", 1, reserved=0)
+        started, release = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        task = asyncio.ensure_future(pool.run_in_executor(PRIORITY_BATCH, work))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        # The caller is gone but the thread still runs
+        held = pool.in_use
+        release.set()
+        result = await pool.run_in_executor(PRIORITY_INTERACTIVE, lambda: "next")
+        return held, result, pool.in_use
+
+    assert asyncio.run(scenario()) == (1, "next", 0)
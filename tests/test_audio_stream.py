@@ -0,0 +1,177 @@
+import asyncio
+import json
+import math
+
+import pytest
+
+from backend.services.audio_stream import (
+    CODEC_OPUS, MAX_FRAME_MS, MIN_FRAME_MS, AudioStreamSession, JitterBuffer, decode_frame, encode_frame
+)
+from backend.utils.admission import ResourcePool
+
+PCM_20MS = b"\x01\x00" * 320
+
+
+def _frame(seq: int):
+    return decode_frame(encode_frame(seq, PCM_20MS))
+
+
+def _seqs(frames):
+    return [frame.seq if frame is not None else None for frame in frames]
+
+
+def test_frames_are_released_in_order():
+    jitter = JitterBuffer(depth=3)
+    released = []
+    for seq in (0, 2, 1, 3, 5, 4):
+        released += jitter.push(_frame(seq))
+    assert _seqs(released) == [0, 1, 2, 3, 4, 5]
+    assert jitter.stats["lost"] == 0
+
+
+def test_lost_frame_is_concealed_after_depth_frames():
+    jitter = JitterBuffer(depth=2)
+    released = []
+    for seq in (0, 2, 3):
+        released += jitter.push(_frame(seq))
+    assert _seqs(released) == [0]
+    released += jitter.push(_frame(4))
+    assert _seqs(released) == [0, None, 2, 3, 4]
+    assert jitter.stats["lost"] == 1
+    # Arrives after its slot was concealed
+    assert jitter.push(_frame(1)) == []
+    assert jitter.stats["late"] == 1
+
+
+def test_duplicates_are_dropped():
+    jitter = JitterBuffer(depth=3)
+    jitter.push(_frame(0))
+    jitter.push(_frame(2))
+    assert jitter.push(_frame(2)) == []
+    assert jitter.push(_frame(0)) == []
+    assert jitter.stats["duplicate"] == 1
+    assert jitter.stats["late"] == 1
+
+
+def test_flush_conceals_gaps():
+    jitter = JitterBuffer(depth=3)
+    jitter.push(_frame(0))
+    jitter.push(_frame(2))
+    jitter.push(_frame(4))
+    assert _seqs(jitter.flush()) == [None, 2, None, 4]
+
+
+@pytest.mark.parametrize("far", [10 ** 8, 0xFFFFFFFF - 4000])
+def test_hostile_sequence_jumps_are_not_concealed(far):
+    jitter = JitterBuffer(depth=3)
+    released = jitter.push(_frame(0))
+    for offset in range(4):
+        released += jitter.push(_frame(far + offset * 1000))
+    released += jitter.flush()
+    assert len(released) == 5
+    assert None not in released
+    assert jitter.stats["resync"] == 4
+    assert jitter.stats["lost"] == 0
+
+
+@pytest.mark.parametrize("duration_ms", [0, MIN_FRAME_MS - 1, MAX_FRAME_MS + 1, 0xFFFF])
+def test_frame_duration_out_of_range_is_rejected(duration_ms):
+    with pytest.raises(ValueError):
+        decode_frame(encode_frame(0, PCM_20MS, duration_ms=duration_ms))
+
+
+class FakeRecognizer:
+    def __init__(self):
+        self.bytes = 0
+
+    def AcceptWaveform(self, pcm):
+        self.bytes += len(pcm)
+        return False
+
+    def PartialResult(self):
+        return json.dumps({"partial": f"{self.bytes} bytes"})
+
+    def FinalResult(self):
+        return json.dumps({"text": "done"})
+
+
+def test_session_concealment_is_bounded():
+    async def scenario():
+        recognizer = FakeRecognizer()
+        session = AudioStreamSession(recognizer, frame_ms=60000)
+        await session.feed(encode_frame(0, PCM_20MS))
+        for offset in range(4):
+            await session.feed(encode_frame(10 ** 8 + offset, PCM_20MS))
+        await session.feed(encode_frame(10 ** 8 + 10, PCM_20MS))
+        text = await session.finish()
+        return session, recognizer, text
+
+    session, recognizer, text = asyncio.run(scenario())
+    assert session.frame_ms == MAX_FRAME_MS
+    assert text == "done"
+    # Six real frames plus at most max_gap concealed frames of MAX_FRAME_MS
+    assert recognizer.bytes <= 6 * len(PCM_20MS) + 3 * 2 * 16 * MAX_FRAME_MS
+
+
+def test_session_recognizes_under_the_stt_pool():
+    class CountingRecognizer(FakeRecognizer):
+        def AcceptWaveform(self, pcm):
+            self.in_use.append(pool.in_use)
+            return super().AcceptWaveform(pcm)
+
+    pool = ResourcePool("stt", 2, reserved=1)
+    recognizer = CountingRecognizer()
+    recognizer.in_use = []
+
+    async def scenario():
+        session = AudioStreamSession(recognizer, stt_pool=pool)
+        for seq in range(3):
+            await session.feed(encode_frame(seq, PCM_20MS))
+        return await session.finish()
+
+    assert asyncio.run(scenario()) == "done"
+    assert recognizer.in_use and set(recognizer.in_use) == {1}
+    assert pool.in_use == 0
+
+
+def _opuslib():
+    # opuslib raises a plain Exception when the libopus shared library is missing
+    try:
+        import opuslib
+    except Exception as e:
+        pytest.skip(f"opuslib unavailable: {e}")
+    return opuslib
+
+
+def test_opus_frames_are_decoded_and_losses_concealed():
+    opuslib = _opuslib()
+    encoder = opuslib.Encoder(16000, 1, opuslib.APPLICATION_VOIP)
+    tone = b"".join(int(8000 * math.sin(2 * math.pi * 440 * n / 16000)).to_bytes(2, "little", signed=True)
+                    for n in range(320))
+    packets = [encoder.encode(tone, 320) for _ in range(6)]
+
+    class RecordingRecognizer(FakeRecognizer):
+        def __init__(self):
+            super().__init__()
+            self.chunks = []
+
+        def AcceptWaveform(self, pcm):
+            self.chunks.append(pcm)
+            return super().AcceptWaveform(pcm)
+
+    async def scenario():
+        recognizer = RecordingRecognizer()
+        session = AudioStreamSession(recognizer, codec="opus", jitter_depth=2)
+        # Packet 2 is lost on the way
+        for seq in (0, 1, 3, 4, 5):
+            await session.feed(encode_frame(seq, packets[seq], CODEC_OPUS, 20))
+        await session.finish()
+        return session, recognizer
+
+    session, recognizer = asyncio.run(scenario())
+    assert session.stats()["lost"] == 1
+    # Five decoded packets plus one concealed frame, 20 ms of PCM16 each
+    pcm = b"".join(recognizer.chunks)
+    assert len(pcm) == 6 * 640
+    samples = [int.from_bytes(pcm[i:i + 2], "little", signed=True) for i in range(0, len(pcm), 2)]
+    assert max(abs(sample) for sample in samples[-320:]) > 1000
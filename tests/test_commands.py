@@ -0,0 +1,17 @@
+from backend.core.commands import Command, parse_command
+
+APPS = ["Notepad", "visual studio code", "browser"]
+
+
+def test_parse_command_recognizes_configured_apps():
+    assert parse_command("open notepad", APPS) == Command("launch_application", "notepad")
+    assert parse_command("Hey Jarvis, close the browser".replace(",", ""), APPS) == \
+        Command("close_application", "browser")
+    assert parse_command("start  Visual Studio Code", APPS) == Command("launch_application", "visual studio code")
+
+
+def test_parse_command_leaves_other_sentences_to_the_llm():
+    assert parse_command("run a marathon", APPS) is None
+    assert parse_command("open", APPS) is None
+    assert parse_command("what is the weather in london", APPS) is None
+    assert parse_command("open notepad", []) is None
@@ -0,0 +1,39 @@
+import asyncio
+
+from backend.core.components import ComponentRegistry
+
+
+def test_failed_required_component_is_reported_and_retried():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("model not found")
+        return "model"
+
+    async def scenario():
+        registry = ComponentRegistry(retry_delay=0.01)
+        registry.register("voice_processor", flaky)
+        registry.register("ai", lambda: "ai", required=False)
+        task = registry.start_background_build()
+        while not registry.errors:
+            await asyncio.sleep(0.001)
+        failed_status = (registry.failed, registry.ready, registry.status()["voice_processor"])
+        await asyncio.wait_for(task, timeout=5)
+        return registry, failed_status
+
+    registry, failed_status = asyncio.run(scenario())
+    assert failed_status == (True, False, "failed")
+    assert len(attempts) == 3
+    assert registry.ready and not registry.failed
+    assert registry.get("voice_processor") == "model"
+
+
+def test_optional_component_failure_does_not_block_readiness():
+    registry = ComponentRegistry(retry_delay=0)
+    registry.register("voice_processor", lambda: "model")
+    registry.register("ai", lambda: 1 / 0, required=False)
+    registry.build()
+    assert registry.ready and not registry.failed
+    assert registry.status() == {"voice_processor": "ready", "ai": "failed"}
@@ -0,0 +1,46 @@
+import asyncio
+import os
+import signal
+
+from backend.utils.drain import GracefulDrain
+
+
+def test_drain_waits_for_in_flight_work():
+    async def scenario():
+        drain = GracefulDrain(timeout=5)
+        drain.begin()
+        asyncio.get_running_loop().call_later(0.05, drain.end)
+        return await drain.drain(), drain.draining
+
+    assert asyncio.run(scenario()) == (True, True)
+
+
+def test_drain_times_out():
+    async def scenario():
+        drain = GracefulDrain(timeout=0.05)
+        drain.begin()
+        return await drain.drain()
+
+    assert asyncio.run(scenario()) is False
+
+
+def test_sigterm_drains_before_server_handler():
+    calls = []
+    original = signal.signal(signal.SIGTERM, lambda sig, frame: calls.append(("server", sig)))
+
+    async def scenario():
+        drain = GracefulDrain(timeout=5)
+        drain.begin()
+        assert drain.install_signal_handler()
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0.05)
+        # Still serving: the server's handler has not run yet
+        calls.append(("draining", drain.draining))
+        drain.end()
+        await asyncio.sleep(0.05)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        signal.signal(signal.SIGTERM, original)
+    assert calls == [("draining", True), ("server", signal.SIGTERM)]
@@ -0,0 +1,22 @@
+import sys
+
+from backend.utils.lazy_import import lazy_module
+
+
+def test_attribute_access_imports_the_module():
+    proxy = lazy_module("colorsys")
+    assert not proxy.is_loaded
+    assert proxy.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert proxy.is_loaded
+
+
+def test_assignment_is_forwarded_to_the_real_module():
+    proxy = lazy_module("json")
+    proxy.JARVIS_TEST_FLAG = True
+    try:
+        assert proxy.is_loaded
+        assert sys.modules["json"].JARVIS_TEST_FLAG is True
+        assert "JARVIS_TEST_FLAG" not in proxy.__dict__
+    finally:
+        del proxy.JARVIS_TEST_FLAG
+    assert not hasattr(sys.modules["json"], "JARVIS_TEST_FLAG")
@@ -0,0 +1,55 @@
+import logging
+
+import pytest
+
+from backend.utils.logging_pipeline import LoggingPipeline, RateLimitFilter
+
+
+def _record(name: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 0, "packet", (), None)
+
+
+def test_sampling_keeps_one_in_n_and_reports_suppressed():
+    rate_filter = RateLimitFilter({"engineio": {"rate": 1000.0, "burst": 1000, "sample": 4}})
+    passed = [record for record in (_record("engineio.server") for _ in range(8)) if rate_filter.filter(record)]
+    assert len(passed) == 2
+    assert passed[0].suppressed == 3
+    assert passed[1].suppressed == 3
+
+
+def test_rate_limit_drops_beyond_burst():
+    rate_filter = RateLimitFilter({"socketio": {"rate": 0.001, "burst": 5, "sample": 1}})
+    assert sum(rate_filter.filter(_record("socketio.server")) for _ in range(20)) == 5
+
+
+def test_warnings_and_unlisted_loggers_always_pass():
+    rate_filter = RateLimitFilter({"engineio": {"rate": 0.001, "burst": 0, "sample": 1}})
+    assert rate_filter.filter(_record("engineio.server", logging.WARNING))
+    assert rate_filter.filter(_record("backend.main"))
+    assert not rate_filter.filter(_record("engineio.server"))
+
+
+def test_set_level_only_accepts_known_loggers(tmp_path):
+    pipeline = LoggingPipeline(log_file=str(tmp_path / "test.log"))
+    try:
+        assert pipeline.set_level("DEBUG", "engineio.server") == logging.DEBUG
+        with pytest.raises(ValueError):
+            pipeline.set_level("DEBUG", "attacker-chosen-name")
+        with pytest.raises(ValueError):
+            pipeline.set_level("LOUD", "backend")
+    finally:
+        logging.getLogger("engineio.server").setLevel(logging.NOTSET)
+        for handler in pipeline.handlers:
+            handler.close()
+
+
+def test_forked_worker_log_file_is_named_by_worker_slot(tmp_path, monkeypatch):
+    pipeline = LoggingPipeline(log_file=str(tmp_path / "jarvis.log"))
+    try:
+        monkeypatch.setenv("JARVIS_WORKER_ID", "2")
+        assert pipeline.worker_log_file() == str(tmp_path / "jarvis.worker2.log")
+        monkeypatch.delenv("JARVIS_WORKER_ID")
+        assert pipeline.worker_log_file().startswith(str(tmp_path / "jarvis."))
+    finally:
+        for handler in pipeline.handlers:
+            handler.close()
@@ -0,0 +1,23 @@
+from backend.main import client_address
+
+
+def test_client_address_prefers_the_asgi_peer():
+    # engineio's ASGI driver hard-codes REMOTE_ADDR
+    environ = {"REMOTE_ADDR": "127.0.0.1", "asgi.scope": {"type": "websocket", "client": ("203.0.113.7", 51234)}}
+    assert client_address(environ) == "203.0.113.7"
+
+
+def test_client_address_falls_back_to_remote_addr():
+    assert client_address({"REMOTE_ADDR": "198.51.100.2", "asgi.scope": {"client": None}}) == "198.51.100.2"
+    assert client_address({}) == "unknown"
+
+
+def test_app_imports_and_serves_health():
+    from fastapi.testclient import TestClient
+
+    from backend.main import app, fastapi_app
+
+    # Without the lifespan no components are built; the route table must still load
+    paths = {route.path for route in fastapi_app.routes}
+    assert {"/health", "/health/ready", "/metrics", "/api/process_voice"} <= paths
+    assert TestClient(app).get("/health/live").status_code == 200
@@ -0,0 +1,42 @@
+from backend.utils.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_quantiles_stay_within_bucket_error():
+    histogram = Histogram()
+    for value in range(1, 10001):
+        histogram.record(value)
+    assert histogram.count == 10000
+    assert histogram.max_us == 10000
+    for q in (0.5, 0.9, 0.99):
+        exact = q * 10000
+        assert abs(histogram.quantile(q) - exact) <= exact * 0.125
+    assert histogram.quantile(1.0) == 10000
+    assert Histogram().quantile(0.5) == 0
+
+
+def test_histogram_cumulative_counts():
+    histogram = Histogram()
+    for value in (5, 5, 100, 5000):
+        histogram.record(value)
+    assert histogram.cumulative([10, 1000, 1_000_000]) == [2, 3, 4]
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.describe("jarvis_requests_total", "Requests")
+    registry.inc("jarvis_requests_total", path='/a"b')
+    registry.inc("jarvis_requests_total", path='/a"b')
+    registry.set("jarvis_sessions", 3)
+    registry.observe("jarvis_latency_seconds", 2000, stage="stt")
+
+    lines = registry.render().splitlines()
+    assert "# HELP jarvis_requests_total Requests" in lines
+    assert "# TYPE jarvis_requests_total counter" in lines
+    assert 'jarvis_requests_total{path="/a\\"b"} 2' in lines
+    assert "jarvis_sessions 3" in lines
+    assert "# TYPE jarvis_latency_seconds histogram" in lines
+    assert 'jarvis_latency_seconds_bucket{stage="stt",le="0.001"} 0' in lines
+    assert 'jarvis_latency_seconds_bucket{stage="stt",le="0.0025"} 1' in lines
+    assert 'jarvis_latency_seconds_bucket{stage="stt",le="+Inf"} 1' in lines
+    assert 'jarvis_latency_seconds_count{stage="stt"} 1' in lines
+    assert 'jarvis_latency_seconds_quantile{stage="stt",quantile="0.5"} 0.002' in lines
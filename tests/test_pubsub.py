@@ -0,0 +1,47 @@
+import asyncio
+
+import socketio
+
+from backend.utils.pubsub import AsyncLocalManager, LocalPubSubHub, create_client_manager
+
+
+async def _relay_emit():
+    hub = LocalPubSubHub(port=0)
+    await hub.start()
+    url = f"local://127.0.0.1:{hub.port}"
+    sender = AsyncLocalManager(url)
+    receiver = AsyncLocalManager(url)
+    received = asyncio.Queue()
+
+    async def handle_emit(message):
+        await received.put(message)
+
+    try:
+        for manager in (sender, receiver):
+            socketio.AsyncServer(async_mode="asgi", client_manager=manager)
+            manager.initialize()
+        receiver._handle_emit = handle_emit
+        # Both managers subscribe from their listener tasks
+        while len(hub.clients) < 2:
+            await asyncio.sleep(0.01)
+
+        await sender.emit("weather_update", {"temp_c": 21}, room="weather:london")
+        return await asyncio.wait_for(received.get(), timeout=5)
+    finally:
+        for manager in (sender, receiver):
+            manager.thread.cancel()
+            manager._reset()
+        await hub.stop()
+
+
+def test_emit_reaches_other_manager():
+    message = asyncio.run(_relay_emit())
+    assert message["method"] == "emit"
+    assert message["event"] == "weather_update"
+    assert message["data"] == [{"temp_c": 21}]
+    assert message["room"] == "weather:london"
+
+
+def test_create_client_manager():
+    assert create_client_manager(None) is None
+    assert isinstance(create_client_manager("local://127.0.0.1:9999"), AsyncLocalManager)
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from backend.services.session_recorder import SessionRecorder, read_recording, write_recording
+
+
+def test_write_read_round_trip(tmp_path):
+    path = str(tmp_path / "session.jvr")
+    frames = [(0, b"\x00" * 8 + b"\x01\x02"), (20, b"\x00" * 8 + b"\x03\x04")]
+    write_recording(path, {"codec": "pcm16", "frame_ms": 20, "language": "en"}, frames, final="open notepad")
+
+    recording = read_recording(path)
+    assert recording.meta == {"codec": "pcm16", "frame_ms": 20, "language": "en"}
+    assert recording.frames == frames
+    assert recording.final == (20, "open notepad")
+    assert recording.duration_ms == 20
+
+
+def test_read_rejects_truncated_and_foreign_files(tmp_path):
+    path = tmp_path / "session.jvr"
+    write_recording(str(path), {"codec": "pcm16"}, [(0, b"\x00" * 40)])
+    path.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(ValueError, match="truncated"):
+        read_recording(str(path))
+
+    other = tmp_path / "clip.wav"
+    other.write_bytes(b"RIFF....")
+    with pytest.raises(ValueError, match="not a voice session recording"):
+        read_recording(str(other))
+
+
+def test_session_recorder_finish_writes_replayable_file(tmp_path):
+    recorder = SessionRecorder({"directory": str(tmp_path)})
+    recorder.start("sid1", {"codec": "pcm16", "frame_ms": 20, "language": "hi"})
+    recorder.frame("sid1", b"\x00" * 12)
+    recorder.partial("sid1", "aaj")
+    recorder.final("sid1", "aaj mausam kaisa hai")
+    recorder.result("sid1", {"type": "response", "text": "Sunny"})
+
+    path = asyncio.run(recorder.finish("sid1"))
+    recording = read_recording(path)
+    assert recording.meta["language"] == "hi"
+    assert [frame for _, frame in recording.frames] == [b"\x00" * 12]
+    assert [text for _, text in recording.partials] == ["aaj"]
+    assert recording.final[1] == "aaj mausam kaisa hai"
+    assert recording.results[0][1] == {"type": "response", "text": "Sunny"}
+    assert asyncio.run(recorder.finish("sid1")) is None
+
+
+def test_session_recorder_respects_max_bytes_and_disabled(tmp_path):
+    recorder = SessionRecorder({"directory": str(tmp_path), "max_bytes": 200})
+    recorder.start("sid1", {"codec": "pcm16"})
+    for _ in range(10):
+        recorder.frame("sid1", b"\x00" * 40)
+    assert recorder.sessions["sid1"].truncated
+    assert recorder.sessions["sid1"].size <= 200
+
+    disabled = SessionRecorder({})
+    disabled.start("sid2", {"codec": "pcm16"})
+    assert not disabled.enabled
+    assert asyncio.run(disabled.finish("sid2")) is None
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+
+from backend.core.ai_integration import GeminiAI
+from backend.services.speculation import SpeculativeExecutor
+from backend.utils.admission import ResourcePool
+
+
+class BlockingModel:
+    """Stands in for the Gemini SDK model: generate_content blocks its thread."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.latency)
+        with self._lock:
+            self.running -= 1
+        return type("Response", (), {"text": f"answer to {prompt}"})()
+
+
+def _ai(latency: float, max_concurrency: int = 4) -> GeminiAI:
+    ai = GeminiAI({"sentiment_analysis": False, "max_concurrency": max_concurrency})
+    ai.model = BlockingModel(latency)
+    return ai
+
+
+def test_cancelled_generate_ends_with_its_sdk_call():
+    async def scenario():
+        ai = _ai(0.2)
+        task = asyncio.ensure_future(ai.generate("hello"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        start = time.perf_counter()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return time.perf_counter() - start, ai.model.running
+
+    waited, running = asyncio.run(scenario())
+    assert waited >= 0.1
+    assert running == 0
+
+
+def test_changing_partials_never_exceed_the_llm_pool():
+    async def scenario():
+        ai = _ai(0.3)
+        pool = ResourcePool("llm", 2, reserved=1)
+        executor = SpeculativeExecutor({"ai": ai}.get, {"stable_ms": 10, "min_words": 1, "llm_pool": pool})
+        executor.start("sid")
+        words = []
+        for word in "what is the weather like in london today".split():
+            words.append(word)
+            executor.on_partial("sid", " ".join(words))
+            await asyncio.sleep(0.03)
+        result = await executor.finish("sid", " ".join(words))
+        await asyncio.sleep(0.4)
+        return ai.model, pool, result
+
+    model, pool, result = asyncio.run(scenario())
+    assert result["text"] == "answer to what is the weather like in london today"
+    # One speculative call (the batch share of the pool) plus the final one
+    assert model.peak <= 2
+    assert model.calls == 2
+    assert pool.in_use == 0
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from backend.services.weather import WeatherService
+from backend.utils.error_handler import WeatherServiceError
+
+PAYLOAD = {
+    "location": {"name": "London"},
+    "current": {"temp_c": 14.0, "condition": {"text": "Cloudy"}, "humidity": 80, "wind_kph": 9.0,
+                "last_updated": "2026-10-19 09:00"},
+}
+
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return PAYLOAD
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    async def get(self, path, params):
+        self.calls.append(params["q"])
+        await asyncio.sleep(0.01)
+        return FakeResponse()
+
+
+def _service(**config) -> WeatherService:
+    service = WeatherService({"api_key": "test", **config})
+    service.client = FakeClient()
+    return service
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    async def scenario():
+        service = _service()
+        results = await asyncio.gather(*(service.get_weather(" London ") for _ in range(10)))
+        await service.get_weather("london")
+        return service, results
+
+    service, results = asyncio.run(scenario())
+    assert service.client.calls == ["london"]
+    assert all(result["temperature"] == 14.0 for result in results)
+
+
+def test_cache_keeps_most_recently_used_locations():
+    async def scenario():
+        service = _service(max_locations=2)
+        for location in ("London", "Paris", "London", "Tokyo"):
+            await service.get_weather(location)
+        return service
+
+    service = asyncio.run(scenario())
+    assert list(service.cache) == ["london", "tokyo"]
+
+
+@pytest.mark.parametrize("location", ["", "x" * 101, "<script>", "a\x00b", 42, None])
+def test_invalid_locations_are_rejected(location):
+    with pytest.raises(WeatherServiceError) as info:
+        WeatherService.normalize_location(location)
+    assert info.value.error_code == "INVALID_LOCATION"
+
+
+@pytest.mark.parametrize("location", ["auto:ip", "51.52,-0.11", "New York", "São Paulo", "मुंबई", "SW1A 1AA"])
+def test_valid_locations_are_accepted(location):
+    assert WeatherService.normalize_location(location)
+
+
+def test_new_locations_share_a_budget():
+    async def scenario():
+        service = _service(new_location_rate=0.001, new_location_burst=2)
+        await service.get_weather("London")
+        await service.get_weather("Paris")
+        # Cached locations are still served
+        await service.get_weather("London")
+        with pytest.raises(WeatherServiceError) as info:
+            await service.get_weather("Tokyo")
+        return service, info.value
+
+    service, error = asyncio.run(scenario())
+    assert error.error_code == "WEATHER_RATE_LIMITED"
+    assert service.client.calls == ["london", "paris"]